@@ -10,10 +10,11 @@ from __future__ import annotations
 import asyncio
 import unittest
 from collections import defaultdict
+from logging import CRITICAL, disable
 from pathlib import Path
 from tempfile import gettempdir
 from typing import Dict
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import ptr
 
@@ -22,15 +23,17 @@ from hypothesis import given, strategies as st
 
 
 # Suppress logging
-ptr.LOG = MagicMock()
+disable(CRITICAL)
 
 
 class TestNamedTuples(unittest.TestCase):
-    @given(stmts=st.floats(), miss=st.floats(), cover=st.floats(), missing=st.text())
+    @given(
+        stmts=st.integers(), miss=st.integers(), cover=st.floats(), missing=st.text()
+    )
     def test_fuzz_coverage_line(self, stmts, miss, cover, missing):
         ptr.coverage_line(stmts=stmts, miss=miss, cover=cover, missing=missing)
 
-    @given(py_files=st.sets(st.text()), base_dir=st.builds(Path))
+    @given(py_files=st.lists(st.text()), base_dir=st.builds(Path))
     def test_fuzz_find_py_files(self, py_files, base_dir):
         ptr.find_py_files(py_files=py_files, base_dir=base_dir)
 
@@ -125,7 +128,7 @@ class TestPtrRunners(unittest.TestCase):
         error_on_warnings,
         system_site_packages,
     ):
-        with patch("builtins.print"), patch("ptr.run_tests"):
+        with patch("builtins.print"), patch("ptr.create_venv"), patch("ptr.run_tests"):
             asyncio.run(
                 ptr.async_main(
                     atonce=atonce,
@@ -200,7 +203,7 @@ class TestPtrRunners(unittest.TestCase):
         test_results = (0, 69)
         with patch("builtins.print"), patch(
             "ptr._test_steps_runner", return_value=test_results
-        ), patch("ptr.chdir"), patch(
+        ), patch(
             "ptr.create_venv",
             return_value=created_venv_path,
         ), patch(
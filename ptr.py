@@ -16,20 +16,26 @@ import argparse
 import ast
 import asyncio
 import logging
+import re
 import sys
-from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Callable, Collection, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from configparser import ConfigParser
 from enum import Enum
-from json import dump
-from os import chdir, cpu_count, environ, getcwd, getpid
-from os.path import sep
+from fnmatch import translate
+from functools import lru_cache
+from hashlib import sha256
+from json import dumps, loads
+from multiprocessing import get_context
+from os import cpu_count, environ, getcwd, getpid, rename, scandir, utime
+from os.path import isabs, normcase, relpath, sep
 from pathlib import Path
 from platform import system
-from shutil import rmtree
-from subprocess import CalledProcessError
+from shutil import copytree, Error as ShutilError, rmtree
+from subprocess import CalledProcessError, DEVNULL, Popen
 from tempfile import gettempdir
 from time import time
+from types import MappingProxyType
 from typing import Any, NamedTuple
 
 # Support pyproject.toml
@@ -43,6 +49,21 @@ if sys.version_info >= (3, 11):  # pragma: no cover
 else:
     import tomli as tomllib  # type: ignore
 
+# Optional faster libuv based event loop - winloop is uvloop for Windows
+try:
+    if sys.platform == "win32":
+        import winloop as uvloop  # type: ignore
+    else:
+        import uvloop  # type: ignore
+except ImportError:
+    uvloop = None  # type: ignore
+
+# Optional C JSON serializer for the stats file
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
 
 LOG = logging.getLogger(__name__)
 MACOSX = system() == "Darwin"
@@ -55,6 +76,16 @@ if sys.platform == "win32":
     asyncio.set_event_loop(asyncio.ProactorEventLoop())
 
 
+def _available_cpus() -> int:
+    """CPUs we are allowed to run on (respects cgroup cpusets) where supported"""
+    try:
+        # Not available on macOS + Windows
+        from os import sched_getaffinity
+    except ImportError:
+        return cpu_count() or 1
+    return len(sched_getaffinity(0)) or 1
+
+
 def _config_default() -> ConfigParser:
     if WINDOWS:
         venv_pkgs = "black coverage flake8 mypy pip pylint setuptools usort"
@@ -64,8 +95,11 @@ def _config_default() -> ConfigParser:
     LOG.info("Using default config settings")
     cp = ConfigParser()
     cp["ptr"] = {}
-    cp["ptr"]["atonce"] = str(int((cpu_count() or 20) / 2) or 1)
-    cp["ptr"]["exclude_patterns"] = "build* yocto"
+    cp["ptr"]["atonce"] = str(_available_cpus())
+    # VCS, cache + virtualenv dirs never hold setup.py files we want to test
+    cp["ptr"][
+        "exclude_patterns"
+    ] = "build* yocto .eggs .git .hg .mypy_cache .tox .venv __pycache__"
     cp["ptr"]["pypi_url"] = "https://pypi.org/simple/"
     cp["ptr"]["venv_pkgs"] = venv_pkgs
     return cp
@@ -79,32 +113,54 @@ def _config_read(
         cp = _config_default()
 
     cwd_path = Path(cwd)
-    root_path = Path(f"{cwd_path.drive}\\") if WINDOWS else Path("/")
-
-    while cwd_path:
-        ptrconfig_path = cwd_path / conf_name
+    # parents stops at the root (or drive) so no need to check for it ourselves
+    for dir_path in (cwd_path, *cwd_path.parents):
+        ptrconfig_path = dir_path / conf_name
         if ptrconfig_path.exists():
             cp.read(str(ptrconfig_path))
 
             LOG.info(f"Loading found config @ {ptrconfig_path}")
             break
 
-        if cwd_path == root_path:
-            break
-
-        cwd_path = cwd_path.parent
-
     return cp
 
 
 CWD = getcwd()
 CONFIG = _config_read(CWD)
+# Resolve the config values we use once - ConfigParser interpolates per access
+EXCLUDE_PATTERNS = frozenset(CONFIG["ptr"].get("exclude_patterns", "").split())
+EXTRA_BUILD_ENV_PATH = (
+    Path(CONFIG["ptr"]["extra_build_env_prefix"])
+    if "extra_build_env_prefix" in CONFIG["ptr"]
+    else None
+)
+PYPI_URL = CONFIG["ptr"]["pypi_url"]
+VENV_PKGS = tuple(CONFIG["ptr"]["venv_pkgs"].split())
 PIP_CONF_TEMPLATE = """\
 [global]
 index-url = {}
 timeout = {}"""
 # Windows venv + pip are super slow
 VENV_TIMEOUT = 120
+MAX_CONCURRENT_INSTALLS = 4
+# Only worth starting worker processes to parse config for big trees
+PARSE_POOL_MIN_SETUP_PYS = 64
+PARSE_POOL_MAX_WORKERS = 8
+# Counters we increment - Always in the stats JSON output, even when 0
+STATS_COUNTERS = ("total.disabled", "total.fails", "total.passes", "total.timeouts")
+# Written into a cached venv once it is fully created + installed
+VENV_CACHE_MARKER = ".ptr_venv_cache_complete"
+# Cached venvs not used for this long get removed when a new one is cached
+VENV_CACHE_MAX_AGE = 14 * 24 * 60 * 60
+# venv_pkgs we only install if at least one test suite enables its step
+LINTER_PKGS = {
+    "black": "run_black",
+    "flake8": "run_flake8",
+    "mypy": "run_mypy",
+    "pylint": "run_pylint",
+    "pyre-check": "run_pyre",
+    "usort": "run_usort",
+}
 
 
 class StepName(Enum):
@@ -119,9 +175,25 @@ class StepName(Enum):
     pyre_run = 9
 
 
+# test_result.returncode is a StepName value - Resolve names once for reporting
+STEP_NAMES = MappingProxyType({a_step.value: a_step.name for a_step in StepName})
+
+# Steps that only read a module so can run concurrently after its tests
+PARALLEL_STEPS = frozenset(
+    (
+        StepName.mypy_run,
+        StepName.usort_run,
+        StepName.black_run,
+        StepName.pylint_run,
+        StepName.flake8_run,
+        StepName.pyre_run,
+    )
+)
+
+
 class coverage_line(NamedTuple):
-    stmts: float
-    miss: float
+    stmts: int
+    miss: int
     cover: float
     missing: str
 
@@ -134,6 +206,17 @@ class step(NamedTuple):
     timeout: float
 
 
+class tool_paths(NamedTuple):
+    black: Path
+    coverage: Path
+    flake8: Path
+    mypy: Path
+    pip: Path
+    pylint: Path
+    pyre: Path
+    usort: Path
+
+
 class test_result(NamedTuple):
     setup_py_path: Path
     returncode: int
@@ -142,6 +225,91 @@ class test_result(NamedTuple):
     timeout: bool
 
 
+def _get_tool_paths(venv_path: Path) -> tool_paths:
+    bin_path = venv_path / ("Scripts" if WINDOWS else "bin")
+    exe = ".exe" if WINDOWS else ""
+    return tool_paths(*(bin_path / f"{tool}{exe}" for tool in tool_paths._fields))
+
+
+def _get_venv_pkgs(tests_to_run: dict[Path, dict]) -> list[str]:
+    """Filter configured venv_pkgs down to the linters some test suite will run"""
+    unused_pkgs = {
+        pkg
+        for pkg, step_key in LINTER_PKGS.items()
+        if not any(config.get(step_key) for config in tests_to_run.values())
+    }
+    venv_pkgs = []
+    for pkg in VENV_PKGS:
+        # Strip any version specifiers / extras to get the package name
+        if re.split(r"[<>=!~;\[]", pkg, maxsplit=1)[0].lower() in unused_pkgs:
+            LOG.debug("Not installing %s as no test suite runs it", pkg)
+            continue
+        venv_pkgs.append(pkg)
+    return venv_pkgs
+
+
+def _get_tests_require(tests_to_run: dict[Path, dict]) -> list[str]:
+    """Sorted union of every test suite's tests_require"""
+    return sorted(
+        {
+            dep
+            for config in tests_to_run.values()
+            for dep in config.get("tests_require") or ()
+        }
+    )
+
+
+def _get_user_cache_path() -> Path:
+    """Per user cache dir - Never a predictable shared path others can write to"""
+    xdg_cache_home = environ.get("XDG_CACHE_HOME", "")
+    # The XDG spec says to ignore relative paths
+    if xdg_cache_home and isabs(xdg_cache_home):
+        return Path(xdg_cache_home) / "ptr"
+    return Path.home() / ".cache" / "ptr"
+
+
+def _owned_by_us(path: Path) -> bool:
+    """Only trust cached venvs we created - Windows' per user profile dirs
+    already keep other users out"""
+    if WINDOWS:
+        return path.exists()
+
+    # Not available on Windows
+    from os import getuid
+
+    try:
+        return path.stat().st_uid == getuid()
+    except OSError:
+        return False
+
+
+def _get_venv_cache_path(
+    mirror: str,
+    system_site_packages: bool,
+    venv_pkgs: Sequence[str],
+    cache_dir: str = "ptr_venv_cache",
+    tests_require: Sequence[str] = (),
+) -> Path:
+    """Key cached venvs on everything that changes what we install into them"""
+    cache_key = sha256(
+        "\n".join(
+            (
+                sys.version,
+                sys.executable,
+                mirror,
+                str(system_site_packages),
+                *sorted(venv_pkgs),
+                # Separate the lists so a package can't move between them
+                "tests_require:",
+                *sorted(tests_require),
+            )
+        ).encode("utf8")
+    ).hexdigest()[:16]
+    return _get_user_cache_path() / cache_dir / cache_key
+
+
+# The venv layout is fixed once created so only scan lib/ once per venv
+@lru_cache(maxsize=8)
 def _get_site_packages_path(venv_path: Path) -> None | Path:
     lib_path = venv_path / ("Lib" if WINDOWS else "lib")
     for apath in lib_path.iterdir():
@@ -154,25 +322,77 @@ def _get_site_packages_path(venv_path: Path) -> None | Path:
     return None
 
 
-def _remove_pct_symbol(pct_str: str) -> str:
-    return pct_str.strip().replace("%", "")
+def _format_missing_lines(statements: Sequence[int], missing: Sequence[int]) -> str:
+    """Collapse missing line numbers into `coverage report -m` style ranges"""
+    missing_lines = set(missing)
+    ranges: list[list[int]] = []
+    in_range = False
+    for line in sorted(statements):
+        if line not in missing_lines:
+            in_range = False
+        elif in_range:
+            ranges[-1][1] = line
+        else:
+            ranges.append([line, line])
+            in_range = True
+    return ", ".join(
+        str(start) if start == end else f"{start}-{end}" for start, end in ranges
+    )
+
+
+def _json_coverage_line(file_coverage: dict[str, Any]) -> coverage_line:
+    summary = file_coverage["summary"]
+    missing = file_coverage.get("missing_lines", [])
+    return coverage_line(
+        summary["num_statements"],
+        summary["missing_lines"],
+        round(float(summary["percent_covered"]), 2),
+        _format_missing_lines(
+            [*file_coverage.get("executed_lines", []), *missing], missing
+        ),
+    )
+
+
+def _display_coverage(summary: dict[str, Any]) -> float:
+    """Coverage % as `coverage report` shows it (rounded to its configured
+    precision) - What required_coverage has always been compared against"""
+    if "percent_covered_display" in summary:
+        return float(summary["percent_covered_display"])
+    return float(round(summary["percent_covered"]))
+
+
+def _format_coverage_report(coverage_report: str) -> str:
+    """Render a `coverage json` report as a human readable table for --print-cov"""
+    try:
+        coverage_json = loads(coverage_report)
+    except ValueError:
+        return coverage_report
+
+    report_lines = [f"{'Name':<50} {'Stmts':>6} {'Miss':>6} {'Cover':>7}   Missing"]
+    all_coverage = [
+        *(
+            (name, _json_coverage_line(cov))
+            for name, cov in coverage_json["files"].items()
+        ),
+        ("TOTAL", _json_coverage_line({"summary": coverage_json["totals"]})),
+    ]
+    for name, cov in all_coverage:
+        report_lines.append(
+            f"{name:<50} {cov.stmts:>6} {cov.miss:>6} {cov.cover:>6}%"
+            + f"   {cov.missing}"
+        )
+    return "\n".join(report_lines)
 
 
 def _analyze_coverage(
     venv_path: Path,
     setup_py_path: Path,
     required_cov: dict[str, float],
-    coverage_report: str,
+    coverage_report: str | bytes,
     stats: dict[str, int],
     test_run_start_time: float,
 ) -> None | test_result:
-    module_path = setup_py_path.parent
-    site_packages_path = _get_site_packages_path(venv_path)
-    if not site_packages_path:
-        LOG.error("Analyze coverage is unable to find site-packages path")
-        return None
-    relative_site_packages = str(site_packages_path.relative_to(venv_path)) + sep
-
+    # Bail before any site-packages lookup or report parsing if there is no work
     if not coverage_report:
         LOG.error(
             f"No coverage report for {setup_py_path} - Unable to enforce coverage"
@@ -183,59 +403,66 @@ def _analyze_coverage(
         LOG.error(f"No required coverage to enforce for {setup_py_path}")
         return None
 
-    coverage_lines = {}
-    for line in coverage_report.splitlines():
-        if not line or line.startswith("-") or line.startswith("Name"):
-            continue
+    module_path = setup_py_path.parent
+    site_packages_path = _get_site_packages_path(venv_path)
+    if not site_packages_path:
+        LOG.error("Analyze coverage is unable to find site-packages path")
+        return None
+    relative_site_packages = relpath(site_packages_path, venv_path) + sep
+    # Absolute paths get these prefixes stripped - site-packages wins if both match
+    abs_path_prefixes = [
+        normcase(str(abs_path)) + sep for abs_path in (site_packages_path, module_path)
+    ]
 
+    try:
+        coverage_json = loads(coverage_report)
+    except ValueError as ve:
+        return test_result(
+            setup_py_path,
+            StepName.analyze_coverage.value,
+            f"Unable to parse coverage JSON report ({ve})",
+            int(time() - test_run_start_time),
+            False,
+        )
+
+    stats_prefix = f"suite.{module_path.name}_coverage"
+    file_stats_prefix = f"{stats_prefix}.file."
+    # Only files with a coverage requirement get their missing lines formatted
+    file_coverages = {}
+    for file_path, file_coverage in coverage_json.get("files", {}).items():
         module_path_str = None
-        sl_path = None
-
-        sl = line.split(maxsplit=4)
-        if sl[0] != "TOTAL":
-            sl_path = _max_osx_private_handle(sl[0], site_packages_path)
-
-        if sl_path and sl_path.is_absolute() and site_packages_path:
-            for possible_abs_path in (module_path, site_packages_path):
-                try:
-                    module_path_str = str(sl_path.relative_to(possible_abs_path))
-                except ValueError as ve:
-                    LOG.debug(ve)
-        elif sl_path:
-            module_path_str = str(sl_path).replace(relative_site_packages, "")
+        sl_path = _max_osx_private_handle(file_path, site_packages_path)
+
+        if isabs(sl_path):
+            norm_sl_path = normcase(sl_path)
+            for abs_path_prefix in abs_path_prefixes:
+                if norm_sl_path.startswith(abs_path_prefix):
+                    module_path_str = sl_path[len(abs_path_prefix) :]
+                    break
         else:
-            module_path_str = sl[0]
+            module_path_str = sl_path.replace(relative_site_packages, "")
 
         if not module_path_str:
             LOG.error(
-                f"[{setup_py_path}] Unable to find path relative path for {sl[0]}"
+                f"[{setup_py_path}] Unable to find path relative path for {file_path}"
             )
             continue
 
-        if len(sl) == 4:
-            coverage_lines[module_path_str] = coverage_line(
-                float(sl[1]), float(sl[2]), float(_remove_pct_symbol(sl[3])), ""
-            )
-        else:
-            coverage_lines[module_path_str] = coverage_line(
-                float(sl[1]), float(sl[2]), float(_remove_pct_symbol(sl[3])), sl[4]
-            )
+        file_coverages[module_path_str] = file_coverage
+        stats[file_stats_prefix + module_path_str] = int(
+            _display_coverage(file_coverage["summary"])
+        )
 
-        if sl[0] != "TOTAL":
-            stats[f"suite.{module_path.name}_coverage.file.{module_path_str}"] = int(
-                coverage_lines[module_path_str].cover
-            )
-        else:
-            stats[f"suite.{module_path.name}_coverage.total"] = int(
-                coverage_lines[module_path_str].cover
-            )
+    if "totals" in coverage_json:
+        file_coverages["TOTAL"] = {"summary": coverage_json["totals"]}
+        stats[f"{stats_prefix}.total"] = int(_display_coverage(coverage_json["totals"]))
 
     failed_output = "The following files did not meet coverage requirements:\n"
     failed_coverage = False
 
     for afile, cov_req in required_cov.items():
         try:
-            cover = coverage_lines[afile].cover
+            cov_lines = _json_coverage_line(file_coverages[afile])
         except KeyError:
             err = (
                 f"{afile} has not reported any coverage. Does the file exist? "
@@ -250,10 +477,12 @@ def _analyze_coverage(
                 False,
             )
 
+        cover = _display_coverage(file_coverages[afile]["summary"])
         if cover < cov_req:
             failed_coverage = True
-            cov_lines = coverage_lines[afile]
-            failed_output += f"  {afile}: {cov_lines.cover} < {cov_req} - Missing: {cov_lines.missing}\n"
+            failed_output += (
+                f"  {afile}: {cover} < {cov_req} - Missing: {cov_lines.missing}\n"
+            )
 
     if failed_coverage:
         failed_cov_runtime = int(time() - test_run_start_time)
@@ -268,33 +497,55 @@ def _analyze_coverage(
     return None
 
 
-def _max_osx_private_handle(
-    potenital_path: str, site_packages_path: Path
-) -> None | Path:
+def _max_osx_private_handle(potenital_path: str, site_packages_path: Path) -> str:
     """On Mac OS X `coverage` seems to always resolve /private for anything stored in /var.
     ptr's usage of gettempdir() seems to result in using dirs within there
     This function strips /private if it exists on the path supplied from coverage
     ONLY IF site_packages_path is not based in /private"""
     if not MACOSX:
-        return Path(potenital_path)
+        return potenital_path
 
     private_path = Path("/private")
-    try:
-        site_packages_path.relative_to(private_path)
-        return Path(potenital_path)
-    except ValueError:
-        pass
+    if site_packages_path == private_path or private_path in site_packages_path.parents:
+        return potenital_path
 
-    return Path(potenital_path.replace("/private", ""))
+    return potenital_path.replace("/private", "")
 
 
-def _write_stats_file(stats_file: str, stats: dict[str, int]) -> None:
+def _get_stats_file_path(stats_file: str) -> Path:
     stats_file_path = Path(stats_file)
     if not stats_file_path.is_absolute():
         stats_file_path = Path(CWD) / stats_file_path
+    return stats_file_path
+
+
+def _read_prior_runtimes(stats_file: str) -> dict[str, int]:
+    """Get each suite's runtime from a previous run's stats file (if any)"""
     try:
-        with stats_file_path.open("w", encoding="utf8") as sfp:
-            dump(stats, sfp, indent=2, sort_keys=True)
+        prior_stats = loads(_get_stats_file_path(stats_file).read_text("utf8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(prior_stats, dict):
+        return {}
+
+    return {
+        k[len("suite.") : -len("_runtime")]: v
+        for k, v in prior_stats.items()
+        if k.startswith("suite.") and k.endswith("_runtime") and isinstance(v, int)
+    }
+
+
+def _write_stats_file(stats_file: str, stats: dict[str, int]) -> None:
+    stats_file_path = _get_stats_file_path(stats_file)
+    # Serialize to UTF-8 bytes in memory then write them out in one go
+    if orjson:
+        stats_json = orjson.dumps(
+            stats, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        )
+    else:
+        stats_json = dumps(stats, indent=2, sort_keys=True).encode("utf8")
+    try:
+        stats_file_path.write_bytes(stats_json)
     except OSError as ose:
         LOG.exception(
             f"Unable to write out JSON statistics file to {stats_file} ({ose})"
@@ -306,9 +557,17 @@ def _generate_black_cmd(module_dir: Path, black_exe: Path) -> tuple[str, ...]:
 
 
 def _generate_install_cmd(
-    pip_exe: str, module_dir: str, config: dict[str, Any]
+    pip_exe: str,
+    module_dir: str,
+    config: dict[str, Any],
+    extra_module_dirs: Sequence[str] = (),
 ) -> tuple[str, ...]:
-    cmds = [pip_exe, "-v", "install", module_dir]
+    cmds = [pip_exe, "install", "--disable-pip-version-check", "--no-color"]
+    # pip's verbose output is only ever surfaced when debugging
+    if LOG.isEnabledFor(logging.DEBUG):
+        cmds.insert(1, "-v")
+    cmds.append(module_dir)
+    cmds.extend(extra_module_dirs)
     if "tests_require" in config and config["tests_require"]:
         for dep in config["tests_require"]:
             cmds.append(dep)
@@ -351,20 +610,30 @@ def _generate_flake8_cmd(
     return tuple(cmds)
 
 
+def _get_sorted_py_files(module_dir: Path) -> list[str]:
+    py_files: list[str] = []
+    find_py_files(py_files, module_dir)
+    py_files.sort()
+    return py_files
+
+
 def _generate_pylint_cmd(
-    module_dir: Path, pylint_exe: Path, config: dict
+    module_dir: Path,
+    pylint_exe: Path,
+    config: dict,
+    py_files: None | Sequence[str] = None,
 ) -> tuple[str, ...]:
     if not config.get("run_pylint", False):
         return ()
 
-    py_files: set[str] = set()
-    find_py_files(py_files, module_dir)
+    if py_files is None:
+        py_files = _get_sorted_py_files(module_dir)
 
     cmds = [str(pylint_exe)]
     pylint_config = module_dir / ".pylint"
     if pylint_config.exists():
         cmds.extend(["--rcfile", str(pylint_config)])
-    return tuple([*cmds, *sorted(py_files)])
+    return tuple([*cmds, *py_files])
 
 
 def _generate_pyre_cmd(
@@ -377,22 +646,29 @@ def _generate_pyre_cmd(
 
 
 def _generate_usort_cmd(
-    module_dir: Path, usort_exe: Path, config: dict
+    module_dir: Path,
+    usort_exe: Path,
+    config: dict,
+    py_files: None | Sequence[str] = None,
 ) -> tuple[str, ...]:
     if not config.get("run_usort", False):
         return ()
 
-    py_files: set[str] = set()
-    find_py_files(py_files, module_dir)
+    if py_files is None:
+        py_files = _get_sorted_py_files(module_dir)
 
-    return (str(usort_exe), "check", *sorted(py_files))
+    return (str(usort_exe), "check", *py_files)
 
 
 def _parse_setup_params(setup_py: Path) -> dict[str, Any]:
     with setup_py.open("r", encoding="utf8") as sp:
-        setup_tree = ast.parse(sp.read())
+        setup_py_src = sp.read()
+    # Most setup.py files do not use ptr - skip parsing them into an AST
+    if "ptr_params" not in setup_py_src:
+        return {}
+    setup_tree = ast.parse(setup_py_src)
 
-    LOG.debug(f"AST visiting {setup_py}")
+    LOG.debug("AST visiting %s", setup_py)
     for node in ast.walk(setup_tree):
         if isinstance(node, ast.Assign):
             for target in node.targets:
@@ -401,11 +677,48 @@ def _parse_setup_params(setup_py: Path) -> dict[str, Any]:
                     continue
 
                 if target_id == "ptr_params":
-                    LOG.debug(f"Found ptr_params in {setup_py}")
+                    LOG.debug("Found ptr_params in %s", setup_py)
                     return dict(ast.literal_eval(node.value))
     return {}
 
 
+def _get_config_files_key(setup_py: Path) -> tuple[None | tuple[int, int], ...]:
+    """(mtime, size) of each file ptr_params can come from - None if missing"""
+    config_files_key: list[None | tuple[int, int]] = []
+    for config_file in (
+        setup_py.parent / PYPROJECT_TOML,
+        setup_py.parent / "setup.cfg",
+        setup_py,
+    ):
+        try:
+            config_stat = config_file.stat()
+        except OSError:
+            config_files_key.append(None)
+            continue
+        config_files_key.append((config_stat.st_mtime_ns, config_stat.st_size))
+    return tuple(config_files_key)
+
+
+# Repeat scans in one process only re-parse config files that have changed
+@lru_cache(maxsize=4096)
+def _parse_ptr_params(
+    setup_py: Path, config_files_key: tuple[None | tuple[int, int], ...]
+) -> Mapping[str, Any]:
+    # If a pyproject.toml or setup.cfg exists lets prefer them
+    # Only if there is a [ptr] section
+    ptr_params = parse_pyproject_toml(setup_py)
+    if not ptr_params:
+        ptr_params = parse_setup_cfg(setup_py)
+    if not ptr_params:
+        ptr_params = _parse_setup_params(setup_py)
+    return MappingProxyType(ptr_params)
+
+
+def _get_ptr_params(setup_py: Path) -> dict[str, Any]:
+    """Picklable entry point so worker processes can parse config files"""
+    return dict(_parse_ptr_params(setup_py, _get_config_files_key(setup_py)))
+
+
 def _get_test_modules(
     base_path: Path,
     stats: dict[str, int],
@@ -413,26 +726,32 @@ def _get_test_modules(
     print_non_configured: bool,
 ) -> dict[Path, dict]:
     get_tests_start_time = time()
-    all_setup_pys = find_setup_pys(
-        base_path,
-        set(CONFIG["ptr"]["exclude_patterns"].split())
-        if CONFIG["ptr"]["exclude_patterns"]
-        else set(),
-    )
+    # Sorted once here so tests_to_run's insertion order is path order
+    all_setup_pys = sorted(find_setup_pys(base_path, EXCLUDE_PATTERNS))
     stats["total.setup_pys"] = len(all_setup_pys)
 
+    # AST parsing is CPU bound so spread big trees over worker processes - Only
+    # while our parse cache is cold as the workers' caches die with them
+    if (
+        len(all_setup_pys) >= PARSE_POOL_MIN_SETUP_PYS
+        and not _parse_ptr_params.cache_info().currsize
+    ):
+        max_workers = min(_available_cpus(), PARSE_POOL_MAX_WORKERS)
+        # We run in an executor thread while the loop drives subprocesses so
+        # forking workers could deadlock - spawn them instead
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=get_context("spawn")
+        ) as pool:
+            all_ptr_params = list(
+                pool.map(_get_ptr_params, all_setup_pys, chunksize=16)
+            )
+    else:
+        all_ptr_params = [_get_ptr_params(setup_py) for setup_py in all_setup_pys]
+
     non_configured_modules: list[Path] = []
     test_modules: dict[Path, dict] = {}
-    for setup_py in all_setup_pys:
+    for setup_py, ptr_params in zip(all_setup_pys, all_ptr_params):
         disabled_err_msg = f"Not running {setup_py} as ptr is disabled via config"
-        # If a pyproject.toml or setup.cfg exists lets prefer them
-        # Only if there is a [ptr] section
-        ptr_params = parse_pyproject_toml(setup_py)
-        if not ptr_params:
-            ptr_params = parse_setup_cfg(setup_py)
-        if not ptr_params:
-            ptr_params = _parse_setup_params(setup_py)
-
         if ptr_params:
             if ptr_params.get("disabled", False) and not run_disabled:
                 LOG.info(disabled_err_msg)
@@ -474,23 +793,43 @@ def _validate_base_dir(base_dir: str) -> Path:
     return base_dir_path
 
 
+async def _read_stdout_and_wait(process: asyncio.subprocess.Process) -> bytes:
+    """stderr is merged into stdout so one reader is all communicate() needs"""
+    stdout = await process.stdout.read() if process.stdout else b""
+    await process.wait()
+    return stdout
+
+
 async def _gen_check_output(
     cmd: Sequence[str],
     timeout: int | float = 30,
-    env: None | dict[str, str] = None,
+    env: None | Mapping[str, str] = None,
     cwd: None | Path = None,
-) -> tuple[bytes, bytes]:
+    merge_stderr: bool = True,
+) -> tuple[bytes, None | bytes]:
     process = await asyncio.create_subprocess_exec(
         *cmd,
         stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.STDOUT,
-        env=env,
+        stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+        # Our envs are shared read only MappingProxyTypes but uvloop's process
+        # transport only accepts a real dict
+        env=dict(env) if env is not None else None,
         cwd=cwd,
+        # Python opens fds non-inheritable (PEP 446) so skip closing them all on
+        # POSIX for every spawn - Windows keeps the default
+        close_fds=WINDOWS,
     )
+    # stderr is None when we send it to stdout
+    stderr: None | bytes = None
     try:
-        (stdout, stderr) = await asyncio.wait_for(process.communicate(), timeout)
-    except asyncio.TimeoutError:
-        process.kill()
+        if merge_stderr:
+            stdout = await asyncio.wait_for(_read_stdout_and_wait(process), timeout)
+        else:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        # Never leave the child running (e.g. a cancelled venv create)
+        if process.returncode is None:
+            process.kill()
         await process.wait()
         raise
 
@@ -503,27 +842,111 @@ async def _gen_check_output(
     return (stdout, stderr)
 
 
-async def _progress_reporter(
-    progress_interval: float, queue: asyncio.Queue, total_tests: int
+async def _install_tests_require(
+    pip_exe: Path,
+    tests_to_run: dict[Path, dict],
+    env: Mapping[str, str],
+    timeout: float,
 ) -> None:
-    while queue.qsize() > 0:
-        done_count = total_tests - queue.qsize()
-        done_pct = int((done_count / total_tests) * 100)
-        LOG.info(f"{done_count} / {total_tests} test suites ran ({done_pct}%)")
-        await asyncio.sleep(progress_interval)
+    """One pip run for every suite's tests_require so each suite's own install
+    finds them satisfied - Suites still list them in case this fails"""
+    tests_require = _get_tests_require(tests_to_run)
+    if not tests_require:
+        return
 
-    LOG.debug("progress_reporter finished")
+    install_cmd = (str(pip_exe), "install", *tests_require)
+    LOG.info(f"Installing {len(tests_require)} tests_require packages for all suites")
+    try:
+        await _gen_check_output(install_cmd, timeout=timeout, env=env)
+    except (asyncio.TimeoutError, CalledProcessError) as e:
+        LOG.error(
+            f"Unable to install all suites' tests_require at once ({e!r}) - "
+            + "Each suite will install its own"
+        )
 
 
-def _set_build_env(build_base_path: None | Path) -> dict[str, str]:
+async def _install_batch(
+    pip_exe: Path,
+    batch: Sequence[Path],
+    tests_to_run: dict[Path, dict],
+    env: Mapping[str, str],
+    install_sem: None | asyncio.Semaphore = None,
+) -> bool:
+    """One pip run installing a batch of modules - False has each suite install
+    itself so any failure is reported against the right setup.py"""
+    module_dirs = [str(setup_py_path.parent) for setup_py_path in batch]
+    tests_require = sorted(
+        {
+            dep
+            for setup_py_path in batch
+            for dep in tests_to_run[setup_py_path].get("tests_require") or ()
+        }
+    )
+    install_cmd = _generate_install_cmd(
+        str(pip_exe), module_dirs[0], {"tests_require": tests_require}, module_dirs[1:]
+    )
+    timeout = sum(
+        tests_to_run[setup_py_path]["test_suite_timeout"] for setup_py_path in batch
+    )
+    LOG.info(f"Installing a batch of {len(batch)} modules")
+    try:
+        if install_sem:
+            async with install_sem:
+                await _gen_check_output(install_cmd, timeout=timeout, env=env)
+        else:
+            await _gen_check_output(install_cmd, timeout=timeout, env=env)
+    except (asyncio.TimeoutError, CalledProcessError) as e:
+        LOG.error(
+            f"Unable to install a batch of {len(batch)} modules ({e!r}) - "
+            + "Each suite will install itself"
+        )
+        return False
+    return True
+
+
+def _progress_reporter(
+    progress_interval: float,
+    test_results: list[test_result],
+    total_tests: int,
+) -> Callable[[], None]:
+    """Log progress every progress_interval via a self rescheduling loop timer
+    rather than a task - Returns a function to stop reporting"""
+    loop = asyncio.get_running_loop()
+    last_done_count = -1
+    handle: None | asyncio.TimerHandle = None
+
+    def _report() -> None:
+        nonlocal handle, last_done_count
+        done_count = len(test_results)
+        if done_count != last_done_count:
+            done_pct = int((done_count / total_tests) * 100)
+            LOG.info(f"{done_count} / {total_tests} test suites ran ({done_pct}%)")
+            last_done_count = done_count
+        handle = loop.call_later(progress_interval, _report)
+
+    def _stop() -> None:
+        if handle:
+            handle.cancel()
+        LOG.debug("progress_reporter finished")
+
+    _report()
+    return _stop
+
+
+@lru_cache(maxsize=None)
+def _set_build_env(build_base_path: None | Path) -> Mapping[str, str]:
+    """Build the base env once per build path - Shared read only by all workers"""
     build_environ = environ.copy()
+    # Save pip a PyPI probe + warning output on every install
+    build_environ.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+    build_environ.setdefault("PIP_NO_PYTHON_VERSION_WARNING", "1")
 
     if not build_base_path or not build_base_path.exists():
         if build_base_path:
             LOG.error(
                 f"Configured local build env path {build_base_path} does not exist"
             )
-        return build_environ
+        return MappingProxyType(build_environ)
 
     if build_base_path.exists():
         build_env_vars = [
@@ -548,12 +971,10 @@ def _set_build_env(build_base_path: None | Path) -> dict[str, str]:
             f"{build_base_path} does not exist. Not add int PATH + INCLUDE Env variables"
         )
 
-    return build_environ
+    return MappingProxyType(build_environ)
 
 
-def _set_pip_mirror(
-    venv_path: Path, mirror: str = CONFIG["ptr"]["pypi_url"], timeout: int = 2
-) -> None:
+def _set_pip_mirror(venv_path: Path, mirror: str = PYPI_URL, timeout: int = 2) -> None:
     if not venv_path.exists():
         LOG.error(f"{venv_path} does not exist - So NOT writing out a pip.conf")
         return
@@ -563,40 +984,56 @@ def _set_pip_mirror(
         print(PIP_CONF_TEMPLATE.format(mirror, timeout), file=pcfp)
 
 
+def _get_step_envs(
+    env: Mapping[str, str], venv_path: Path, error_on_warnings: bool
+) -> dict[StepName, Mapping[str, str]]:
+    """Overlay the few vars tests + pyre change on the shared base env once"""
+    pyre_env = MappingProxyType({**env, "PYTHONPATH": str(venv_path)})
+    tests_env = pyre_env
+    # If we're running tests and we want warnings to be errors
+    if error_on_warnings:
+        tests_env = MappingProxyType({**pyre_env, "PYTHONWARNINGS": "error"})
+        LOG.debug("Setting PYTHONWARNINGS to error")
+    return {StepName.tests_run: tests_env, StepName.pyre_run: pyre_env}
+
+
 async def _test_steps_runner(
     test_run_start_time: int,
     tests_to_run: dict[Path, dict],
     setup_py_path: Path,
     venv_path: Path,
-    env: dict,
+    tools: tool_paths,
+    env: Mapping[str, str],
     stats: dict[str, int],
     error_on_warnings: bool,
     print_cov: bool = False,
+    install_sem: None | asyncio.Semaphore = None,
+    step_envs: None | Mapping[StepName, Mapping[str, str]] = None,
+    pip_installed: bool = False,
+    lint_sem: None | asyncio.Semaphore = None,
 ) -> tuple[None | test_result, int]:
-    bin_dir = "Scripts" if WINDOWS else "bin"
-    exe = ".exe" if WINDOWS else ""
-    black_exe = venv_path / bin_dir / f"black{exe}"
-    coverage_exe = venv_path / bin_dir / f"coverage{exe}"
-    flake8_exe = venv_path / bin_dir / f"flake8{exe}"
-    mypy_exe = venv_path / bin_dir / f"mypy{exe}"
-    pip_exe = venv_path / bin_dir / f"pip{exe}"
-    pylint_exe = venv_path / bin_dir / f"pylint{exe}"
-    pyre_exe = venv_path / bin_dir / f"pyre{exe}"
-    usort_exe = venv_path / bin_dir / f"usort{exe}"
     config = tests_to_run[setup_py_path]
+    if step_envs is None:
+        step_envs = _get_step_envs(env, venv_path, error_on_warnings)
+    # Walk the module for .py files once if both pylint + usort need them
+    py_files = (
+        _get_sorted_py_files(setup_py_path.parent)
+        if config.get("run_pylint") and config.get("run_usort")
+        else None
+    )
 
     steps = (
         step(
             StepName.pip_install,
-            True,
-            _generate_install_cmd(str(pip_exe), str(setup_py_path.parent), config),
+            not pip_installed,
+            _generate_install_cmd(str(tools.pip), str(setup_py_path.parent), config),
             f"Installing {setup_py_path} + deps",
             config["test_suite_timeout"],
         ),
         step(
             StepName.tests_run,
             bool("test_suite" in config and config["test_suite"]),
-            _generate_test_suite_cmd(coverage_exe, config),
+            _generate_test_suite_cmd(tools.coverage, config),
             f"Running {config.get('test_suite', '')} tests via coverage",
             config["test_suite_timeout"],
         ),
@@ -610,88 +1047,96 @@ async def _test_steps_runner(
                     and len(config["required_coverage"]) > 0
                 )
             ),
-            (str(coverage_exe), "report", "-m"),
+            (str(tools.coverage), "json", "-o", "-"),
             f"Analyzing coverage report for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.mypy_run,
             bool("run_mypy" in config and config["run_mypy"]),
-            _generate_mypy_cmd(setup_py_path.parent, mypy_exe, config),
+            _generate_mypy_cmd(setup_py_path.parent, tools.mypy, config),
             f"Running mypy for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.usort_run,
             bool("run_usort" in config and config["run_usort"]),
-            _generate_usort_cmd(setup_py_path.parent, usort_exe, config),
+            _generate_usort_cmd(setup_py_path.parent, tools.usort, config, py_files),
             f"Running usort for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.black_run,
             bool("run_black" in config and config["run_black"]),
-            _generate_black_cmd(setup_py_path.parent, black_exe),
+            _generate_black_cmd(setup_py_path.parent, tools.black),
             f"Running black for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.flake8_run,
             bool("run_flake8" in config and config["run_flake8"]),
-            _generate_flake8_cmd(setup_py_path.parent, flake8_exe, config),
+            _generate_flake8_cmd(setup_py_path.parent, tools.flake8, config),
             f"Running flake8 for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.pylint_run,
             bool("run_pylint" in config and config["run_pylint"]),
-            _generate_pylint_cmd(setup_py_path.parent, pylint_exe, config),
+            _generate_pylint_cmd(setup_py_path.parent, tools.pylint, config, py_files),
             f"Running pylint for {setup_py_path}",
             config["test_suite_timeout"],
         ),
         step(
             StepName.pyre_run,
             bool("run_pyre" in config and config["run_pyre"] and not WINDOWS),
-            _generate_pyre_cmd(setup_py_path.parent, pyre_exe, config),
+            _generate_pyre_cmd(setup_py_path.parent, tools.pyre, config),
             f"Running pyre for {setup_py_path}",
             config["test_suite_timeout"],
         ),
     )
 
-    steps_ran = 0
-    for a_step in steps:
+    async def _run_step(a_step: step) -> None | test_result:
         a_test_result = None
-        # Skip test if disabled
-        if not a_step.run_condition:
-            LOG.info(f"Not running {a_step.log_message} step")
-            continue
-
         LOG.info(a_step.log_message)
         stdout = b""
-        steps_ran += 1
         try:
             if a_step.cmds:
-                LOG.debug(f"CMD: {' '.join(a_step.cmds)}")
-
-                # If we're running tests and we want warnings to be errors
-                step_env = env
-                if a_step.step_name in [StepName.tests_run, StepName.pyre_run]:
-                    step_env = env.copy()
-                    step_env["PYTHONPATH"] = getcwd()
-
-                if a_step.step_name == StepName.tests_run and error_on_warnings:
-                    step_env["PYTHONWARNINGS"] = "error"
-                    LOG.debug("Setting PYTHONWARNINGS to error")
-
-                stdout, _stderr = await _gen_check_output(
-                    a_step.cmds, a_step.timeout, env=step_env, cwd=setup_py_path.parent
-                )
+                LOG.debug("CMD: %s", " ".join(a_step.cmds))
+
+                step_env = step_envs.get(a_step.step_name, env)
+                # Limit concurrent pip runs + linters across all runners - test
+                # steps stay fully parallel
+                step_sem = lint_sem if a_step.step_name in PARALLEL_STEPS else None
+                if a_step.step_name is StepName.pip_install:
+                    step_sem = install_sem
+                # Coverage warnings on stderr would corrupt the JSON report
+                merge_stderr = a_step.step_name is not StepName.analyze_coverage
+
+                if step_sem:
+                    async with step_sem:
+                        stdout, _stderr = await _gen_check_output(
+                            a_step.cmds,
+                            a_step.timeout,
+                            env=step_env,
+                            cwd=setup_py_path.parent,
+                            merge_stderr=merge_stderr,
+                        )
+                else:
+                    stdout, _stderr = await _gen_check_output(
+                        a_step.cmds,
+                        a_step.timeout,
+                        env=step_env,
+                        cwd=setup_py_path.parent,
+                        merge_stderr=merge_stderr,
+                    )
             else:
-                LOG.debug(f"Skipping running a cmd for {a_step} step")
+                LOG.debug("Skipping running a cmd for %s step", a_step)
         except CalledProcessError as cpe:
             err_output = cpe.stdout.decode("utf8")
+            if cpe.stderr:
+                err_output += cpe.stderr.decode("utf8")
 
-            LOG.debug(f"{a_step.log_message} FAILED for {setup_py_path}")
+            LOG.debug("%s FAILED for %s", a_step.log_message, setup_py_path)
             a_test_result = test_result(
                 setup_py_path,
                 a_step.step_name.value,
@@ -700,7 +1145,9 @@ async def _test_steps_runner(
                 False,
             )
         except asyncio.TimeoutError as toe:
-            LOG.debug(f"{setup_py_path} timed out running {a_step.log_message} ({toe})")
+            LOG.debug(
+                "%s timed out running %s (%s)", setup_py_path, a_step.log_message, toe
+            )
             a_test_result = test_result(
                 setup_py_path,
                 a_step.step_name.value,
@@ -710,82 +1157,114 @@ async def _test_steps_runner(
             )
 
         if a_step.step_name is StepName.analyze_coverage:
-            cov_report = stdout.decode("utf8") if stdout else ""
+            # json.loads() takes the raw bytes so only decode a copy to print
+            cov_report = stdout or b""
             if print_cov:
-                print(f"{setup_py_path}:\n{cov_report}")
+                print(
+                    f"{setup_py_path}:\n"
+                    + _format_coverage_report(cov_report.decode("utf8"))
+                )
                 if "required_coverage" not in config:
                     # Add fake 0% TOTAL coverage required so step passes
                     config["required_coverage"] = {"TOTAL": 0}
 
-            if a_step.run_condition:
-                a_test_result = _analyze_coverage(
-                    venv_path,
-                    setup_py_path,
-                    config["required_coverage"],
-                    cov_report,
-                    stats,
-                    test_run_start_time,
-                )
+            # Disabled steps have already continued so we know we need to analyze
+            a_test_result = _analyze_coverage(
+                venv_path,
+                setup_py_path,
+                config["required_coverage"],
+                cov_report,
+                stats,
+                test_run_start_time,
+            )
 
+        return a_test_result
+
+    steps_ran = 0
+    parallel_steps: list[step] = []
+    for a_step in steps:
+        # Skip test if disabled
+        if not a_step.run_condition:
+            LOG.info(f"Not running {a_step.log_message} step")
+            continue
+
+        # Lint + type checking steps only read the module so run them together
+        if a_step.step_name in PARALLEL_STEPS:
+            parallel_steps.append(a_step)
+            continue
+
+        steps_ran += 1
+        a_test_result = await _run_step(a_step)
         # If we've had a failure return
         if a_test_result:
             return a_test_result, steps_ran
 
+    steps_ran += len(parallel_steps)
+    for a_test_result in await asyncio.gather(*map(_run_step, parallel_steps)):
+        # Report the first failure in step order
+        if a_test_result:
+            return a_test_result, steps_ran
+
     return None, steps_ran
 
 
 async def _test_runner(
-    queue: asyncio.Queue,
+    tests_list: Sequence[Path],
+    tests_idx: list[int],
     tests_to_run: dict[Path, dict],
     test_results: list[test_result],
     venv_path: Path,
+    tools: tool_paths,
+    env: Mapping[str, str],
     print_cov: bool,
     stats: dict[str, int],
     error_on_warnings: bool,
-    idx: int,
+    install_sem: None | asyncio.Semaphore = None,
+    batch_size: int = 1,
+    lint_sem: None | asyncio.Semaphore = None,
 ) -> None:
-    extra_build_env_path = (
-        Path(CONFIG["ptr"]["extra_build_env_prefix"])
-        if "extra_build_env_prefix" in CONFIG["ptr"]
-        else None
-    )
-    env = _set_build_env(extra_build_env_path)
-
-    while True:
-        try:
-            setup_py_path = queue.get_nowait()
-        except asyncio.QueueEmpty:
-            LOG.debug(f"test_runner {idx} exiting")
-            return
-
-        test_run_start_time = int(time())
-        test_fail_result, steps_ran = await _test_steps_runner(
-            test_run_start_time,
-            tests_to_run,
-            setup_py_path,
-            venv_path,
-            env,
-            stats,
-            error_on_warnings,
-            print_cov,
+    step_envs = _get_step_envs(env, venv_path, error_on_warnings)
+    # Runners share tests_idx - safe as we never await between read + increment
+    while tests_idx[0] < len(tests_list):
+        batch = tests_list[tests_idx[0] : tests_idx[0] + batch_size]
+        tests_idx[0] += len(batch)
+
+        # Pay pip's startup + resolve once for the whole batch
+        batch_installed = len(batch) > 1 and await _install_batch(
+            tools.pip, batch, tests_to_run, env, install_sem
         )
-        total_success_runtime = int(time() - test_run_start_time)
-        if test_fail_result:
-            test_results.append(test_fail_result)
-        else:
-            success_output = f"{setup_py_path} has passed all configured tests"
-            LOG.info(success_output)
-            test_results.append(
-                test_result(
-                    setup_py_path, 0, success_output, total_success_runtime, False
-                )
+        for setup_py_path in batch:
+            test_run_start_time = int(time())
+            test_fail_result, steps_ran = await _test_steps_runner(
+                test_run_start_time,
+                tests_to_run,
+                setup_py_path,
+                venv_path,
+                tools,
+                env,
+                stats,
+                error_on_warnings,
+                print_cov,
+                install_sem,
+                step_envs,
+                batch_installed,
+                lint_sem,
             )
+            total_success_runtime = int(time() - test_run_start_time)
+            if test_fail_result:
+                test_results.append(test_fail_result)
+            else:
+                success_output = f"{setup_py_path} has passed all configured tests"
+                LOG.info(success_output)
+                test_results.append(
+                    test_result(
+                        setup_py_path, 0, success_output, total_success_runtime, False
+                    )
+                )
 
-        stats_name = setup_py_path.parent.name
-        stats[f"suite.{stats_name}_runtime"] = total_success_runtime
-        stats[f"suite.{stats_name}_completed_steps"] = steps_ran
-
-        queue.task_done()
+            stats_name = setup_py_path.parent.name
+            stats[f"suite.{stats_name}_runtime"] = total_success_runtime
+            stats[f"suite.{stats_name}_completed_steps"] = steps_ran
 
 
 async def create_venv(
@@ -794,81 +1273,342 @@ async def create_venv(
     install_pkgs: bool = True,
     timeout: float = VENV_TIMEOUT,
     system_site_packages: bool = False,
+    venv_pkgs: None | Sequence[str] = None,
+    venv_path: None | Path = None,
+    create: bool = True,
 ) -> None | Path:
     start_time = time()
-    venv_path = Path(gettempdir()) / f"ptr_venv_{getpid()}"
-    if WINDOWS:
-        pip_exe = venv_path / "Scripts" / "pip.exe"
-    else:
-        pip_exe = venv_path / "bin" / "pip"
+    if not venv_path:
+        venv_path = Path(gettempdir()) / f"ptr_venv_{getpid()}"
+    pip_exe = _get_tool_paths(venv_path).pip
 
     install_cmd: list[str] = []
     try:
-        cmd = [py_exe, "-m", "venv", str(venv_path)]
-        if system_site_packages:
-            cmd.append("--system-site-packages")
-
-        await _gen_check_output(cmd, timeout=timeout)
-        _set_pip_mirror(venv_path, mirror)
+        # create=False only installs venv_pkgs into an already created venv
+        if create:
+            cmd = [py_exe, "-m", "venv", str(venv_path)]
+            if system_site_packages:
+                cmd.append("--system-site-packages")
+
+            await _gen_check_output(cmd, timeout=timeout)
+            _set_pip_mirror(venv_path, mirror)
         if install_pkgs:
             install_cmd = [str(pip_exe), "install"]
-            install_cmd.extend(CONFIG["ptr"]["venv_pkgs"].split())
-            await _gen_check_output(install_cmd, timeout=timeout)
+            install_cmd.extend(VENV_PKGS if venv_pkgs is None else venv_pkgs)
+            await _gen_check_output(install_cmd, timeout=timeout, cwd=venv_path)
     except CalledProcessError as cpe:
         LOG.exception(f"Failed to setup venv @ {venv_path} - '{install_cmd}'' ({cpe})")
         if cpe.stderr:
-            LOG.debug(f"venv stderr:\n{cpe.stderr.decode('utf8')}")
+            LOG.debug("venv stderr:\n%s", cpe.stderr.decode("utf8"))
         if cpe.output:
-            LOG.debug(f"venv stdout:\n{cpe.output.decode('utf8')}")
+            LOG.debug("venv stdout:\n%s", cpe.output.decode("utf8"))
         return None
 
     runtime = int(time() - start_time)
-    LOG.info(f"Successfully created venv @ {venv_path} to run tests ({runtime}s)")
+    if create:
+        LOG.info(f"Successfully created venv @ {venv_path} to run tests ({runtime}s)")
+    else:
+        LOG.info(f"Successfully installed venv_pkgs into {venv_path} ({runtime}s)")
     return venv_path
 
 
-def find_py_files(py_files: set[str], base_dir: Path) -> None:
-    dirs = [d for d in base_dir.iterdir() if d.is_dir() and not d.name.startswith(".")]
-    py_files.update(
-        {str(x) for x in base_dir.iterdir() if x.is_file() and x.suffix == ".py"}
-    )
-    for directory in dirs:
-        find_py_files(py_files, directory)
+def _clone_venv(src_venv_path: Path, dest_venv_path: Path) -> bool:
+    """Copy a venv + repoint its scripts' shebangs etc. at the new location"""
+    # Windows' script .exe launchers embed their python path - so can't rewrite
+    if WINDOWS:
+        return False
+
+    rmtree(str(dest_venv_path), ignore_errors=True)
+    try:
+        copytree(str(src_venv_path), str(dest_venv_path), symlinks=True)
+    except (OSError, ShutilError) as e:
+        LOG.error(f"Unable to clone {src_venv_path} to {dest_venv_path} ({e})")
+        rmtree(str(dest_venv_path), ignore_errors=True)
+        return False
+
+    _repoint_venv_scripts(dest_venv_path, src_venv_path, dest_venv_path)
+    return True
+
+
+def _repoint_venv_scripts(venv_path: Path, old_path: Path, new_path: Path) -> None:
+    old_path_bytes = str(old_path).encode("utf8")
+    new_path_bytes = str(new_path).encode("utf8")
+    for script in (venv_path / "bin").iterdir():
+        if script.is_symlink() or not script.is_file():
+            continue
+        script_bytes = script.read_bytes()
+        if old_path_bytes in script_bytes:
+            script.write_bytes(script_bytes.replace(old_path_bytes, new_path_bytes))
+
+
+def _publish_venv(build_venv_path: Path, venv_path: Path) -> bool:
+    """Mark a fully built venv complete + rename() it to venv_path so other runs
+    never see it half built - The build is discarded if another run beat us"""
+    try:
+        _repoint_venv_scripts(build_venv_path, build_venv_path, venv_path)
+        (build_venv_path / VENV_CACHE_MARKER).touch()
+        # Left behind by a killed run as complete venvs always have the marker
+        if venv_path.exists() and not (venv_path / VENV_CACHE_MARKER).exists():
+            rmtree(str(venv_path), ignore_errors=True)
+        rename(build_venv_path, venv_path)
+    except OSError as ose:
+        LOG.debug("Unable to publish %s to %s: %s", build_venv_path, venv_path, ose)
+        rmtree(str(build_venv_path), ignore_errors=True)
+        return False
+    return True
+
+
+def _prune_venv_cache(venv_cache_dir: Path) -> None:
+    """Remove our cached venvs (+ builds killed runs left) unused for a while"""
+    oldest_mtime = time() - VENV_CACHE_MAX_AGE
+    try:
+        with scandir(str(venv_cache_dir)) as dir_entries:
+            entries = list(dir_entries)
+    except OSError as ose:
+        LOG.debug("Unable to scan venv cache %s: %s", venv_cache_dir, ose)
+        return
+
+    for entry in entries:
+        path = Path(entry.path)
+        if not entry.is_dir(follow_symlinks=False) or not _owned_by_us(path):
+            continue
+        # Cache hits touch the marker so it records when a venv was last used
+        marker_path = path / VENV_CACHE_MARKER
+        try:
+            last_used = (marker_path if marker_path.exists() else path).stat().st_mtime
+        except OSError:
+            continue
+        if last_used < oldest_mtime:
+            LOG.debug("Pruning unused cached venv %s", path)
+            _rmtree_in_background(path)
+
 
+async def _get_cached_venv(
+    venv_cache_path: Path,
+    mirror: str,
+    venv_timeout: float,
+    system_site_packages: bool,
+    venv_pkgs: Sequence[str],
+    tests_to_run: dict[Path, dict],
+) -> None | Path:
+    """Clone the cached venv for this run to install its suites into - Building
+    + publishing it first on a cache miss"""
+    # Cached venvs are only ever used via a clone so concurrent runs can't
+    # install their suites over each other's
+    if WINDOWS:
+        return None
 
-def _recursive_find_files(
-    files: set[Path], base_dir: Path, exclude_patterns: set[str], follow_symlinks: bool
+    marker_path = venv_cache_path / VENV_CACHE_MARKER
+    if not _owned_by_us(marker_path):
+        venv_cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        build_venv_path = await create_venv(
+            mirror=mirror,
+            timeout=venv_timeout,
+            system_site_packages=system_site_packages,
+            venv_pkgs=venv_pkgs,
+            venv_path=venv_cache_path.with_name(
+                f"{venv_cache_path.name}.{getpid()}.tmp"
+            ),
+        )
+        if not build_venv_path:
+            return None
+        # tests_require is part of the cache key so install them before publishing
+        await _install_tests_require(
+            _get_tool_paths(build_venv_path).pip,
+            tests_to_run,
+            _set_build_env(EXTRA_BUILD_ENV_PATH),
+            venv_timeout,
+        )
+        if _publish_venv(build_venv_path, venv_cache_path):
+            LOG.info(f"Cached venv @ {venv_cache_path} for later runs")
+            _prune_venv_cache(venv_cache_path.parent)
+
+    venv_path = Path(gettempdir()) / f"ptr_venv_{getpid()}_clone"
+    try:
+        # Record the cache hit so pruning keeps it
+        utime(marker_path)
+    except OSError as ose:
+        LOG.debug("Unable to use cached venv %s: %s", venv_cache_path, ose)
+        return None
+    if not _clone_venv(venv_cache_path, venv_path):
+        return None
+    LOG.info(f"Cloned cached venv {venv_cache_path} to {venv_path}")
+    return venv_path
+
+
+def _rmtree_in_background(path: Path) -> None:
+    """Move path aside + delete it from a detached process so we can exit now"""
+    trash_path = path.with_name(f"{path.name}.trash")
+    try:
+        path.rename(trash_path)
+        Popen(
+            (
+                sys.executable,
+                "-c",
+                "import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)",
+                str(trash_path),
+            ),
+            stdin=DEVNULL,
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as ose:
+        LOG.debug("Unable to remove %s in the background (%s)", path, ose)
+        rmtree(str(path if path.exists() else trash_path), ignore_errors=True)
+
+
+async def _cancel_venv_create(venv_create_task: asyncio.Future[None | Path]) -> None:
+    venv_create_task.cancel()
+    try:
+        venv_path = await venv_create_task
+    except asyncio.CancelledError:
+        venv_path = None
+    venv_path = venv_path or Path(gettempdir()) / f"ptr_venv_{getpid()}"
+    if venv_path.exists():
+        _rmtree_in_background(venv_path)
+
+
+async def _get_fresh_venv(
+    venv_create_task: asyncio.Future[None | Path],
+    mirror: str,
+    venv_timeout: float,
+    system_site_packages: bool,
+    venv_pkgs: Sequence[str],
+) -> None | Path:
+    """Clone a pristine template venv if we have one - Otherwise finish creating
+    the bare venv venv_create_task started + snapshot it as the template"""
+    venv_template_path = _get_venv_cache_path(
+        mirror, system_site_packages, venv_pkgs, "ptr_venv_template"
+    )
+    template_owned = _owned_by_us(venv_template_path)
+    if venv_template_path.exists() and not template_owned:
+        LOG.error(f"Not using venv template @ {venv_template_path} as we do not own it")
+    elif template_owned and _owned_by_us(venv_template_path / VENV_CACHE_MARKER):
+        await _cancel_venv_create(venv_create_task)
+        try:
+            # Record the template being used so pruning keeps it
+            utime(venv_template_path / VENV_CACHE_MARKER)
+        except OSError as ose:
+            LOG.debug("Unable to mark venv template as used: %s", ose)
+        # Clone to a path of our own - Anything the cancelled venv create left
+        # running can only ever write to the path it was given
+        venv_path = Path(gettempdir()) / f"ptr_venv_{getpid()}_clone"
+        if _clone_venv(venv_template_path, venv_path):
+            LOG.info(f"Cloned venv template {venv_template_path} to {venv_path}")
+            return venv_path
+        return await create_venv(
+            mirror=mirror,
+            timeout=venv_timeout,
+            system_site_packages=system_site_packages,
+            venv_pkgs=venv_pkgs,
+            venv_path=venv_path,
+        )
+
+    fresh_venv_path = await venv_create_task
+    if not fresh_venv_path:
+        return None
+    fresh_venv_path = await create_venv(
+        mirror=mirror,
+        timeout=venv_timeout,
+        venv_pkgs=venv_pkgs,
+        venv_path=fresh_venv_path,
+        create=False,
+    )
+    # Never snapshot into a template path someone else has put there
+    if fresh_venv_path and (template_owned or not venv_template_path.exists()):
+        venv_template_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Snapshot to a path of our own so concurrent runs never share a copy
+        snapshot_path = venv_template_path.with_name(
+            f"{venv_template_path.name}.{getpid()}.tmp"
+        )
+        if _clone_venv(fresh_venv_path, snapshot_path) and _publish_venv(
+            snapshot_path, venv_template_path
+        ):
+            _prune_venv_cache(venv_template_path.parent)
+    return fresh_venv_path
+
+
+def find_py_files(py_files: list[str], base_dir: Path) -> None:
+    dirs_to_scan = [str(base_dir)]
+    while dirs_to_scan:
+        with scandir(dirs_to_scan.pop()) as dir_entries:
+            for entry in dir_entries:
+                if entry.is_dir():
+                    if not entry.name.startswith("."):
+                        dirs_to_scan.append(entry.path)
+                elif entry.name.endswith(".py") and entry.name != ".py":
+                    if entry.is_file():
+                        py_files.append(entry.path)
+
+
+def _find_setup_py_files(
+    files: set[Path],
+    base_dir: Path,
+    exclude_patterns: Collection[str],
+    follow_symlinks: bool,
 ) -> None:
     if not base_dir.exists():
         return
 
-    dirs = [d for d in base_dir.iterdir() if d.is_dir()]
-    files.update(
-        {x for x in base_dir.iterdir() if x.is_file() and x.name == "setup.py"}
+    # Patterns on just the dir name (most of them) are combined into one regex
+    # Ones spanning multiple path components still need Path.match()
+    name_exclude_patterns = []
+    path_exclude_patterns = []
+    for exclude_pattern in exclude_patterns:
+        if not exclude_pattern or exclude_pattern == ".":
+            LOG.error(f"Got a bad/empty exclude pattern: {exclude_pattern}")
+            continue
+        if "/" in exclude_pattern or "\\" in exclude_pattern:
+            path_exclude_patterns.append(exclude_pattern)
+        else:
+            name_exclude_patterns.append(exclude_pattern)
+    name_exclude_re = (
+        re.compile(
+            "|".join(translate(pattern) for pattern in name_exclude_patterns),
+            # Path.match() is case insensitive on Windows
+            re.IGNORECASE if WINDOWS else 0,
+        )
+        if name_exclude_patterns
+        else None
     )
-    for directory in dirs:
-        if not follow_symlinks and directory.is_symlink():
+
+    # Iterative DFS with scandir as DirEntry caches the type info from readdir
+    dirs_to_scan = [str(base_dir)]
+    while dirs_to_scan:
+        try:
+            with scandir(dirs_to_scan.pop()) as dir_entries:
+                entries = list(dir_entries)
+        except OSError as ose:
+            LOG.debug("Unable to scan directory: %s", ose)
             continue
 
-        skip_dir = False
-        for exclude_pattern in exclude_patterns:
-            if not exclude_pattern or exclude_pattern == ".":
-                LOG.error(f"Got a bad/empty exclude pattern: {exclude_pattern}")
+        for entry in entries:
+            if entry.name == "setup.py":
+                if entry.is_file():
+                    files.add(Path(entry.path))
                 continue
-            if directory.match(exclude_pattern):
-                skip_dir = True
-                LOG.debug(
-                    f"Skipping {directory} due to exclude pattern {exclude_pattern}"
-                )
-        if not skip_dir:
-            _recursive_find_files(files, directory, exclude_patterns, follow_symlinks)
+            if not entry.is_dir():
+                continue
+            if not follow_symlinks and entry.is_symlink():
+                continue
+
+            if name_exclude_re and name_exclude_re.match(entry.name):
+                LOG.debug("Skipping %s due to an exclude pattern", entry.path)
+                continue
+            if path_exclude_patterns:
+                directory = Path(entry.path)
+                if any(directory.match(pattern) for pattern in path_exclude_patterns):
+                    LOG.debug("Skipping %s due to an exclude pattern", entry.path)
+                    continue
+            dirs_to_scan.append(entry.path)
 
 
 def find_setup_pys(
-    base_path: Path, exclude_patterns: set[str], follow_symlinks: bool = False
+    base_path: Path, exclude_patterns: Collection[str], follow_symlinks: bool = False
 ) -> set[Path]:
     setup_pys: set[Path] = set()
-    _recursive_find_files(setup_pys, base_path, exclude_patterns, follow_symlinks)
+    _find_setup_py_files(setup_pys, base_path, exclude_patterns, follow_symlinks)
     return setup_pys
 
 
@@ -907,14 +1647,16 @@ def parse_setup_cfg(setup_py: Path) -> dict[str, Any]:
 
     # Create a setup.py like ptr_params to return
     ptr_params["required_coverage"] = {}
-    for key, value in cp["ptr"].items():
+    ptr_section = cp["ptr"]
+    for key, value in ptr_section.items():
         if key.startswith(req_cov_key_strip):
-            key = key.strip(req_cov_key_strip)
+            # Slice off the prefix - str.strip() would eat matching chars of paths
+            key = key[len(req_cov_key_strip) :]
             ptr_params["required_coverage"][key] = int(value)
         elif key.startswith("run_") or key == "disabled":
-            ptr_params[key] = cp.getboolean("ptr", key)
+            ptr_params[key] = ptr_section.getboolean(key)
         elif key == "test_suite_timeout":
-            ptr_params[key] = cp.getint("ptr", key)
+            ptr_params[key] = ptr_section.getint(key)
         else:
             ptr_params[key] = value
 
@@ -931,53 +1673,62 @@ def print_test_results(
     test_results: Sequence[test_result], stats: None | dict[str, int] = None
 ) -> dict[str, int]:
     if not stats:
-        stats = defaultdict(int)
+        stats = dict.fromkeys(STATS_COUNTERS, 0)
 
-    # Ensure we always have 0 counters in stats JSON output
-    # Thus must have been working due to defaultdict + printing the keys
-    # Let us be more explicit
+    # (Re)count the results - total.disabled was counted during discovery
     stats["total.fails"] = 0
     stats["total.passes"] = 0
     stats["total.test_suites"] = len(test_results)
     stats["total.timeouts"] = 0
-    if "total.disabled" not in stats:
-        stats["total.disabled"] = 0
+    stats.setdefault("total.disabled", 0)
 
-    fail_output = ""
-    for result in sorted(test_results):
+    # Tally in one pass - Only failures need sorting for a stable report order
+    failed_results = []
+    for result in test_results:
         if result.returncode:
             if result.timeout:
                 stats["total.timeouts"] += 1
             else:
                 stats["total.fails"] += 1
-            fail_output += (
-                f"{result.setup_py_path} (failed '{StepName(result.returncode).name}' "
-                + f"step):\n{result.output}\n"
-            )
+            failed_results.append(result)
         else:
             stats["total.passes"] += 1
 
-    total_time = -1 if "runtime.all_tests" not in stats else stats["runtime.all_tests"]
-    print(f"-- Summary (total time {total_time}s):\n")
+    total_time = stats.get("runtime.all_tests", -1)
+    total_test_suites = stats["total.test_suites"]
+    # Build the whole report and print it once rather than line by line
     # TODO: Hardcode some workaround to ensure Windows always prints UTF8
     # https://github.com/facebookincubator/ptr/issues/34
-    print(f"✅ PASS: {stats.get('total.passes', 0)}")
-    print(f"❌ FAIL: {stats.get('total.fails', 0)}")
-    print(f"⌛ TIMEOUT: {stats.get('total.timeouts', 0)}")
-    print(f"🔒 DISABLED: {stats.get('total.disabled', 0)}")
-    print(f"💩 TOTAL: {stats.get('total.test_suites', 0)}\n")
-    if "total.setup_pys" in stats and stats["total.setup_pys"] > 0:
-        stats["pct.setup_py_ptr_enabled"] = int(
-            stats["total.test_suites"] / stats["total.setup_pys"] * 100
+    report = [
+        f"-- Summary (total time {total_time}s):\n",
+        f"✅ PASS: {stats['total.passes']}",
+        f"❌ FAIL: {stats['total.fails']}",
+        f"⌛ TIMEOUT: {stats['total.timeouts']}",
+        f"🔒 DISABLED: {stats['total.disabled']}",
+        f"💩 TOTAL: {total_test_suites}\n",
+    ]
+    total_setup_pys = stats.get("total.setup_pys", 0)
+    # Integer math - float division can round e.g. 29 / 100 * 100 down to 28
+    enabled_pct = (
+        total_test_suites * 100 // total_setup_pys if total_setup_pys > 0 else 0
+    )
+    stats["pct.setup_py_ptr_enabled"] = enabled_pct
+    if total_setup_pys > 0:
+        report.append(
+            f"-- {total_test_suites} / {total_setup_pys} "
+            + f"({enabled_pct}%) `setup.py`'s have `ptr` tests running\n"
         )
-        print(
-            f"-- {stats['total.test_suites']} / {stats['total.setup_pys']} "
-            + f"({stats['pct.setup_py_ptr_enabled']}%) `setup.py`'s have "
-            + "`ptr` tests running\n"
+    if failed_results:
+        report.append("-- Failure Output --\n")
+        # Failure output can be MBs of tracebacks so join once - no str +=
+        report.append(
+            "".join(
+                f"{result.setup_py_path} (failed '{STEP_NAMES[result.returncode]}' "
+                + f"step):\n{result.output}\n"
+                for result in sorted(failed_results)
+            )
         )
-    if fail_output:
-        print("-- Failure Output --\n")
-        print(fail_output)
+    print("\n".join(report))
 
     return stats
 
@@ -995,65 +1746,140 @@ async def run_tests(
     venv_timeout: float,
     error_on_warnings: bool,
     system_site_packages: bool,
+    venv_cache: bool = False,
+    venv_create_task: None | asyncio.Future[None | Path] = None,
+    batch_size: int = 1,
 ) -> int:
     tests_start_time = time()
+    venv_keep_reason = "due to CLI arguments"
 
-    if not venv_path or not venv_path.exists():
+    if venv_create_task:
+        # Bare venv was created while we discovered tests - now finish it
         venv_create_start_time = time()
-        venv_path = await create_venv(
-            mirror=mirror,
-            timeout=venv_timeout,
-            system_site_packages=system_site_packages,
+        venv_path = await _get_fresh_venv(
+            venv_create_task,
+            mirror,
+            venv_timeout,
+            system_site_packages,
+            _get_venv_pkgs(tests_to_run),
         )
         stats["venv_create_time"] = int(time() - venv_create_start_time)
+    elif not venv_path or not venv_path.exists():
+        venv_pkgs = _get_venv_pkgs(tests_to_run)
+        # Suites' packages get installed into a cached venv too so key on them
+        venv_cache_path = (
+            _get_venv_cache_path(
+                mirror,
+                system_site_packages,
+                venv_pkgs,
+                tests_require=_get_tests_require(tests_to_run),
+            )
+            if venv_cache
+            else None
+        )
+        if (
+            venv_cache_path
+            and venv_cache_path.exists()
+            and not _owned_by_us(venv_cache_path)
+        ):
+            LOG.error(f"Not using venv cache @ {venv_cache_path} as we do not own it")
+            venv_cache_path = None
+        venv_create_start_time = time()
+        venv_path = (
+            await _get_cached_venv(
+                venv_cache_path,
+                mirror,
+                venv_timeout,
+                system_site_packages,
+                venv_pkgs,
+                tests_to_run,
+            )
+            if venv_cache_path
+            else None
+        )
+        if not venv_path:
+            venv_path = await create_venv(
+                mirror=mirror,
+                timeout=venv_timeout,
+                system_site_packages=system_site_packages,
+                venv_pkgs=venv_pkgs,
+            )
+        stats["venv_create_time"] = int(time() - venv_create_start_time)
     else:
         venv_keep = True
-    if not venv_path or not venv_path.exists():
+        venv_keep_reason = "as it was passed in via --venv"
+    # Every branch above gives us an existing venv or None on failure
+    if not venv_path:
         LOG.error("Unable to make a venv to run tests in. Exiting")
         return 3
 
-    # Be at the base of the venv to ensure we have a known neutral cwd
-    chdir(str(venv_path))
-
-    queue: asyncio.Queue = asyncio.Queue()
-    for test_setup_py in sorted(tests_to_run.keys()):
-        await queue.put(test_setup_py)
+    if atonce < 1:
+        LOG.error(f"Need to run at least 1 test at once (got {atonce}). Exiting.")
+        return 254
+    if batch_size < 1:
+        LOG.error(f"Need a batch size of at least 1 test (got {batch_size}). Exiting.")
+        return 254
 
+    # atonce runners pull the next suite to run from one list. Start the suites
+    # that were slowest last run first so one long suite is not left till last
+    # tests_to_run is already in path order (see _get_test_modules) and sort()
+    # is stable so ties keep it
+    prior_runtimes = _read_prior_runtimes(stats_file)
+    tests_list = list(tests_to_run)
+    if prior_runtimes:
+        tests_list.sort(key=lambda p: -prior_runtimes.get(p.parent.name, 0))
+    total_tests = len(tests_list)
+    tests_idx = [0]
+    # pip installs into the shared venv thrash disk + the mirror so cap them
+    install_sem = asyncio.Semaphore(min(atonce, MAX_CONCURRENT_INSTALLS))
+    # Each suite runs its linters at once so bound them by CPUs not atonce
+    lint_sem = asyncio.Semaphore(_available_cpus())
+    env = _set_build_env(EXTRA_BUILD_ENV_PATH)
+    tools = _get_tool_paths(venv_path)
+    await _install_tests_require(tools.pip, tests_to_run, env, venv_timeout)
     test_results: list[test_result] = []
-    consumers = [
+    test_runners = [
         _test_runner(
-            queue,
+            tests_list,
+            tests_idx,
             tests_to_run,
             test_results,
             venv_path,
+            tools,
+            env,
             print_cov,
             stats,
             error_on_warnings,
-            i + 1,
+            install_sem,
+            batch_size,
+            lint_sem,
         )
-        for i in range(atonce)
+        # Ceiling division - No point in runners that will never get a batch
+        for _ in range(min(atonce, -(-total_tests // batch_size)))
     ]
-    if progress_interval:
-        LOG.debug(f"Adding progress reporter to report every {progress_interval}s")
-        consumers.append(
-            _progress_reporter(progress_interval, queue, len(tests_to_run))
+    stop_progress_reporter = None
+    # Also rules out NaN intervals + nothing to report on
+    if progress_interval > 0 and total_tests:
+        LOG.debug("Adding progress reporter to report every %ss", progress_interval)
+        stop_progress_reporter = _progress_reporter(
+            progress_interval, test_results, total_tests
         )
 
-    LOG.debug("Starting to run tests")
-    if not consumers:
-        LOG.error("Got no _test_runner coros to gather. Exiting run_tests.")
-        return 254
-    await asyncio.gather(*consumers)
+    LOG.debug("Starting to run %d test suites", total_tests)
+    try:
+        await asyncio.gather(*test_runners)
+    finally:
+        if stop_progress_reporter:
+            stop_progress_reporter()
 
     stats["runtime.all_tests"] = int(time() - tests_start_time)
     stats = print_test_results(test_results, stats)
     _write_stats_file(stats_file, stats)
 
     if not venv_keep:
-        chdir(gettempdir())
-        rmtree(str(venv_path))
+        _rmtree_in_background(venv_path)
     else:
-        LOG.info(f"Not removing venv @ {venv_path} due to CLI arguments")
+        LOG.info(f"Not removing venv @ {venv_path} {venv_keep_reason}")
 
     return stats.get("total.fails", 0) + stats.get("total.timeouts", 0)
 
@@ -1072,15 +1898,31 @@ async def async_main(
     venv_timeout: float,
     error_on_warnings: bool,
     system_site_packages: bool,
+    venv_cache: bool = False,
+    batch_size: int = 1,
 ) -> int:
-    stats: dict[str, int] = defaultdict(int)
-    tests_to_run = _get_test_modules(
-        base_path, stats, run_disabled, print_non_configured
+    stats: dict[str, int] = dict.fromkeys(STATS_COUNTERS, 0)
+    # A cached venv is usually reused so only overlap creating a fresh one
+    venv_create_task: None | asyncio.Task[None | Path] = None
+    if not venv and not venv_cache and not print_non_configured:
+        venv_create_task = asyncio.create_task(
+            create_venv(
+                mirror=mirror,
+                install_pkgs=False,
+                timeout=venv_timeout,
+                system_site_packages=system_site_packages,
+            )
+        )
+
+    tests_to_run = await asyncio.get_running_loop().run_in_executor(
+        None, _get_test_modules, base_path, stats, run_disabled, print_non_configured
     )
     if not tests_to_run:
         LOG.error(
             f"{str(base_path)} has no setup.py files with unit tests defined. Exiting"
         )
+        if venv_create_task:
+            await _cancel_venv_create(venv_create_task)
         return 1
 
     if print_non_configured:
@@ -1107,6 +1949,9 @@ async def async_main(
         venv_timeout,
         error_on_warnings,
         system_site_packages,
+        venv_cache,
+        venv_create_task,
+        batch_size,
     )
 
 
@@ -1126,6 +1971,12 @@ def main() -> None:
         default=CWD,
         help=f"Path to recursively look for setup.py files [Default: {CWD}]",
     )
+    parser.add_argument(
+        "--batch-size",
+        default=1,
+        type=int,
+        help="How many setup.py's each runner pip installs together [Default: 1]",
+    )
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Verbose debug output"
     )
@@ -1141,10 +1992,14 @@ def main() -> None:
     parser.add_argument(
         "-m",
         "--mirror",
-        default=CONFIG["ptr"]["pypi_url"],
-        help=(
-            f"URL for pip to use for Simple API [Default: {CONFIG['ptr']['pypi_url']}]"
-        ),
+        default=PYPI_URL,
+        help=f"URL for pip to use for Simple API [Default: {PYPI_URL}]",
+    )
+    parser.add_argument(
+        "--no-venv-cache",
+        action="store_false",
+        dest="venv_cache",
+        help="Create a fresh venv rather than reusing a cached one",
     )
     parser.add_argument(
         "--print-cov", action="store_true", help="Print modules coverage report"
@@ -1189,6 +2044,9 @@ def main() -> None:
     _handle_debug(args.debug)
 
     LOG.info(f"Starting {sys.argv[0]}")
+    if uvloop:
+        LOG.debug("Using %s event loop", uvloop.__name__)
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     sys.exit(
         asyncio.run(
             async_main(
@@ -1205,6 +2063,8 @@ def main() -> None:
                 args.venv_timeout,
                 args.error_on_warnings,
                 args.system_site_packages,
+                args.venv_cache,
+                args.batch_size,
             )
         )
     )
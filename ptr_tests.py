@@ -11,12 +11,14 @@ import asyncio
 import unittest
 from collections import defaultdict
 from collections.abc import Sequence
-from copy import deepcopy
-from os import environ
+from logging import CRITICAL, disable
+from os import close, environ, getpid, O_CREAT, O_WRONLY, open as os_open, sep, utime
 from pathlib import Path
 from shutil import rmtree
 from subprocess import CalledProcessError
+from sys import executable, version_info
 from tempfile import gettempdir, TemporaryDirectory
+from time import time
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -25,11 +27,13 @@ import ptr_tests_fixtures
 
 # Set a global for our file encoding - pylint recommendation
 FILE_ENCODING = "utf8"
+# Directory of this checkout - Holds our setup.py and ptrconfig.sample
+BASE_PATH = Path(__file__).parent
 
 # Turn off logging for unit tests - Comment out to enable
-ptr.LOG = Mock()
-# Hacky global for a monkey patch of asyncio.qsize()
-TOTAL_REPORTER_TESTS = 4
+disable(CRITICAL)
+# Number of steps our fake test steps runner reports running
+FAKE_STEPS_RAN = 4
 
 
 async def async_none(*args: Any, **kwargs: Any) -> None:
@@ -40,30 +44,33 @@ async def check_site_package_config(cmd: Sequence, *args: Any, **kwargs: Any) ->
     assert "--system-site-packages" in cmd, f"--system-site-packages not found in {cmd}"
 
 
-def fake_get_event_loop(*args: Any, **kwargs: Any) -> ptr_tests_fixtures.FakeEventLoop:
-    return ptr_tests_fixtures.FakeEventLoop()
-
-
 async def fake_test_steps_runner(*args: Any, **kwargs: Any) -> tuple[None, int]:
-    return (None, TOTAL_REPORTER_TESTS)
+    return (None, FAKE_STEPS_RAN)
 
 
 async def return_bytes_output(*args: Any, **kwargs: Any) -> tuple[bytes, bytes]:
     return (b"Unitest stdout", b"Unittest stderr")
 
 
-def return_specific_pid(*args: Any, **kwargs: Any) -> int:
-    return 2580217
-
-
 def return_zero(*args: Any, **kwargs: Any) -> int:
     return 0
 
 
+def expected_params_without(*keys: str) -> dict[str, Any]:
+    """Fresh top level copy of EXPECTED_TEST_PARAMS (nested values are shared)"""
+    return {
+        key: value
+        for key, value in ptr_tests_fixtures.EXPECTED_TEST_PARAMS.items()
+        if key not in keys
+    }
+
+
 def touch_files(*paths: Path) -> None:
+    # Make each parent dir once + create files without touch()'s utime call
+    for parent in {path.parent for path in paths}:
+        parent.mkdir(parents=True, exist_ok=True)
     for path in paths:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.touch(exist_ok=True)
+        close(os_open(path, O_WRONLY | O_CREAT, 0o644))
 
 
 # TODO: Rewrite using all latest asyncio testing tools
@@ -72,7 +79,10 @@ class TestPtr(unittest.TestCase):
     maxDiff = 2000
 
     def setUp(self) -> None:
-        self.loop = asyncio.new_event_loop()
+        # Test on the same (uv|win)loop event loop ptr runs on if installed
+        self.loop = (
+            ptr.uvloop.new_event_loop() if ptr.uvloop else asyncio.new_event_loop()
+        )
         return super().setUp()
 
     def tearDown(self) -> None:
@@ -88,19 +98,35 @@ class TestPtr(unittest.TestCase):
         self.assertIsNone(
             ptr._analyze_coverage(fake_path, fake_path, {}, "Fake Cov Report", {}, 0)
         )
+        # A report we can't parse must fail the step rather than pass it
+        bad_report = "CoverageWarning: Unrecognized option\n{}"
+        tr = ptr._analyze_coverage(
+            fake_path, fake_path, {"TOTAL": 1}, bad_report, {}, 0
+        )
+        self.assertIsNotNone(tr)
+        if tr:
+            self.assertFalse(tr.timeout)
+            self.assertEqual(tr.returncode, ptr.StepName.analyze_coverage.value)
+            self.assertIn("Unable to parse coverage JSON report", tr.output)
 
     @patch("ptr.time")
     @patch("ptr.LOG.error")
-    @patch("ptr.getpid", return_specific_pid)
     def test_analyze_coverage(self, mock_log: Mock, mock_time: Mock) -> None:
         mock_time.return_value = 0
         fake_setup_py = Path("unittest/setup.py")
         if "VIRTUAL_ENV" in environ:
             fake_venv_path = Path(environ["VIRTUAL_ENV"])
         else:
-            fake_venv_path = self.loop.run_until_complete(
-                ptr.create_venv("https://pypi.com/s", install_pkgs=False)
-            )
+            # Only the site-packages dir gets looked up - No need for a real venv
+            fake_venv_path = ptr_tests_fixtures.HARD_SET_VENV
+            python_lib = f"python{version_info.major}.{version_info.minor}"
+            if ptr.WINDOWS:
+                site_packages_path = fake_venv_path / "Lib" / "site-packages"
+            else:
+                site_packages_path = (
+                    fake_venv_path / "lib" / python_lib / "site-packages"
+                )
+            site_packages_path.mkdir(parents=True, exist_ok=True)
         self.assertIsNone(
             ptr._analyze_coverage(fake_venv_path, fake_setup_py, {}, "", {}, 0)
         )
@@ -108,92 +134,122 @@ class TestPtr(unittest.TestCase):
             ptr._analyze_coverage(fake_venv_path, fake_setup_py, {"bla": 69}, "", {}, 0)
         )
 
-        # Test with simple py_modules
-        self.assertEqual(
-            ptr._analyze_coverage(
-                fake_venv_path,
-                fake_setup_py,
+        cov_report = (
+            ptr_tests_fixtures.SAMPLE_WIN_TG_REPORT_OUTPUT
+            if ptr.WINDOWS
+            else ptr_tests_fixtures.SAMPLE_NIX_TG_REPORT_OUTPUT
+        )
+        cases: tuple[
+            tuple[str, dict[str, float], str | bytes, ptr.test_result], ...
+        ] = (
+            (
+                "simple py_modules",
                 ptr_tests_fixtures.FAKE_REQ_COVERAGE,
                 ptr_tests_fixtures.SAMPLE_REPORT_OUTPUT,
-                {},
-                0,
+                ptr_tests_fixtures.EXPECTED_COVERAGE_FAIL_RESULT,
             ),
-            ptr_tests_fixtures.EXPECTED_COVERAGE_FAIL_RESULT,
-        )
-
-        # Test with float coverage
-        self.assertEqual(
-            ptr._analyze_coverage(
-                fake_venv_path,
-                fake_setup_py,
+            (
+                "raw coverage bytes",
+                ptr_tests_fixtures.FAKE_REQ_COVERAGE,
+                ptr_tests_fixtures.SAMPLE_REPORT_OUTPUT.encode("utf8"),
+                ptr_tests_fixtures.EXPECTED_COVERAGE_FAIL_RESULT,
+            ),
+            (
+                "float coverage",
                 ptr_tests_fixtures.FAKE_REQ_COVERAGE,
                 ptr_tests_fixtures.SAMPLE_FLOAT_REPORT_OUTPUT,
-                {},
-                0,
+                ptr_tests_fixtures.EXPECTED_COVERAGE_FAIL_RESULT,
             ),
-            ptr_tests_fixtures.EXPECTED_COVERAGE_FAIL_RESULT,
-        )
-
-        # Test with venv installed modules
-        cov_report = (
-            ptr_tests_fixtures.SAMPLE_WIN_TG_REPORT_OUTPUT
-            if ptr.WINDOWS
-            else ptr_tests_fixtures.SAMPLE_NIX_TG_REPORT_OUTPUT
-        )
-        self.assertEqual(
-            ptr._analyze_coverage(
-                fake_venv_path,
-                fake_setup_py,
+            (
+                "venv installed modules",
                 ptr_tests_fixtures.FAKE_TG_REQ_COVERAGE,
                 cov_report,
-                {},
-                0,
+                ptr_tests_fixtures.EXPECTED_PTR_COVERAGE_FAIL_RESULT,
             ),
-            ptr_tests_fixtures.EXPECTED_PTR_COVERAGE_FAIL_RESULT,
-        )
-        # Test we error on non existent files with coverage requirements
-        self.assertEqual(
-            ptr._analyze_coverage(
-                fake_venv_path, fake_setup_py, {"fake_file.py": 48}, cov_report, {}, 0
+            (
+                "non existent files with coverage requirements",
+                {"fake_file.py": 48},
+                cov_report,
+                ptr_tests_fixtures.EXPECTED_PTR_COVERAGE_MISSING_FILE_RESULT,
             ),
-            ptr_tests_fixtures.EXPECTED_PTR_COVERAGE_MISSING_FILE_RESULT,
         )
+        for case, required_cov, report, expected in cases:
+            with self.subTest(case):
+                self.assertEqual(
+                    ptr._analyze_coverage(
+                        fake_venv_path, fake_setup_py, required_cov, report, {}, 0
+                    ),
+                    expected,
+                )
+        # Stats match the rounded coverage `coverage report` shows
+        stats: dict[str, int] = {}
+        ptr._analyze_coverage(
+            fake_venv_path,
+            fake_setup_py,
+            ptr_tests_fixtures.FAKE_REQ_COVERAGE,
+            ptr_tests_fixtures.SAMPLE_FLOAT_REPORT_OUTPUT,
+            stats,
+            0,
+        )
+        self.assertEqual(stats[f"suite.unittest_coverage.file.unittest{sep}ptr.py"], 69)
+        self.assertEqual(stats["suite.unittest_coverage.total"], 99)
         self.assertTrue(mock_log.called)
         # Dont delete the VIRTUAL_ENV carrying the test if we didn't make it
         if "VIRTUAL_ENV" not in environ:
             rmtree(fake_venv_path)
 
+    def test_display_coverage(self) -> None:
+        # 83.6% shows as 84% in `coverage report` so meets a requirement of 84
+        self.assertEqual(
+            ptr._display_coverage(
+                {"percent_covered": 83.6, "percent_covered_display": "84"}
+            ),
+            84.0,
+        )
+        self.assertEqual(
+            ptr._display_coverage(
+                {"percent_covered": 83.6, "percent_covered_display": "83.6"}
+            ),
+            83.6,
+        )
+        # Older reports without the display value get rounded the same way
+        self.assertEqual(ptr._display_coverage({"percent_covered": 83.6}), 84.0)
+
+    def test_format_coverage_report(self) -> None:
+        cov_table = ptr._format_coverage_report(
+            ptr_tests_fixtures.SAMPLE_FLOAT_REPORT_OUTPUT
+        )
+        self.assertIn("69.0%   70-72, 76-94, 98", cov_table)
+        self.assertTrue(cov_table.splitlines()[-1].startswith("TOTAL"))
+        # Non JSON reports are returned untouched
+        self.assertEqual(ptr._format_coverage_report("Not JSON"), "Not JSON")
+
     def test_mac_osx_slash_private(self) -> None:
-        macosx = ptr.MACOSX
         non_private_path_str = "/var/tmp"
         private_path_str = f"/private{non_private_path_str}"
         site_packages_path = Path("/var/tmp/venv/lib/site-packages/")
-        try:
-            ptr.MACOSX = False
+        with patch("ptr.MACOSX", False):
             self.assertEqual(
-                Path(private_path_str),
+                private_path_str,
                 ptr._max_osx_private_handle(private_path_str, site_packages_path),
             )
 
-            ptr.MACOSX = True
+        with patch("ptr.MACOSX", True):
             self.assertEqual(
-                Path(non_private_path_str),
+                non_private_path_str,
                 ptr._max_osx_private_handle(private_path_str, site_packages_path),
             )
 
             site_packages_path = Path("/private/var/tmp/venv/lib/site-packages/")
             self.assertEqual(
-                Path(private_path_str),
+                private_path_str,
                 ptr._max_osx_private_handle(private_path_str, site_packages_path),
             )
-        finally:
-            # Ensure we also restore if we're MACOSX or not
-            ptr.MACOSX = macosx
 
     @patch("ptr.run_tests", async_none)
     @patch("ptr._get_test_modules")
     def test_async_main(self, mock_gtm: Mock) -> None:
-        args = [
+        args: list[Any] = [
             1,
             Path("/"),
             "mirror",
@@ -222,16 +278,210 @@ class TestPtr(unittest.TestCase):
             self.loop.run_until_complete(ptr.async_main(*args))  # pyre-ignore
         )
 
+    @patch("ptr.run_tests", async_none)
+    @patch("ptr.create_venv")
+    @patch("ptr._get_test_modules")
+    def test_async_main_overlaps_venv_create(
+        self, mock_gtm: Mock, mock_create_venv: Mock
+    ) -> None:
+        mock_create_venv.side_effect = async_none
+        mock_gtm.return_value = {}
+        # No --venv or venv cache so creating a venv overlaps finding tests
+        self.assertEqual(
+            self.loop.run_until_complete(
+                ptr.async_main(
+                    atonce=1,
+                    base_path=Path("/"),
+                    mirror="mirror",
+                    progress_interval=1,
+                    venv="",
+                    venv_keep=True,
+                    print_cov=True,
+                    print_non_configured=False,
+                    run_disabled=True,
+                    stats_file="stats",
+                    venv_timeout=30,
+                    error_on_warnings=True,
+                    system_site_packages=False,
+                    venv_cache=False,
+                )
+            ),
+            1,
+        )
+        mock_create_venv.assert_called_once()
+        self.assertFalse(mock_create_venv.call_args[1]["install_pkgs"])
+
+    @patch("ptr._rmtree_in_background")
+    def test_cancel_venv_create(self, mock_rmtree: Mock) -> None:
+        with TemporaryDirectory() as td:
+            venv_path = Path(td)
+
+            async def creating_venv() -> None | Path:
+                await asyncio.sleep(60)
+                return None
+
+            async def created_venv() -> None | Path:
+                return venv_path
+
+            async def cancel_venv_creates() -> asyncio.Task:
+                # Still creating - Cancelled with nothing on disk to remove
+                running_task = asyncio.create_task(creating_venv())
+                await ptr._cancel_venv_create(running_task)
+                # Already created - Its venv gets removed
+                done_task = asyncio.create_task(created_venv())
+                await asyncio.sleep(0)
+                await ptr._cancel_venv_create(done_task)
+                return running_task
+
+            running_task = self.loop.run_until_complete(cancel_venv_creates())
+            self.assertTrue(running_task.cancelled())
+            mock_rmtree.assert_called_once_with(venv_path)
+
+    def run_get_fresh_venv(self, venv_create_coro: Any) -> tuple[Any, asyncio.Task]:
+        async def get_fresh_venv() -> tuple[Any, asyncio.Task]:
+            venv_create_task = asyncio.create_task(venv_create_coro)
+            fresh_venv = await ptr._get_fresh_venv(
+                venv_create_task, "https://pip.com/", 1, False, ["black"]
+            )
+            return fresh_venv, venv_create_task
+
+        return self.loop.run_until_complete(get_fresh_venv())
+
+    @patch("ptr.create_venv")
+    @patch("ptr._clone_venv")
+    @patch("ptr._get_venv_cache_path")
+    def test_get_fresh_venv_from_template(
+        self, mock_cache_path: Mock, mock_clone: Mock, mock_create_venv: Mock
+    ) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            template_path = td_path / "template"
+            touch_files(template_path / ptr.VENV_CACHE_MARKER)
+            mock_cache_path.return_value = template_path
+
+            # Clone to its own path while the bare venv create is cancelled
+            mock_clone.return_value = True
+            venv_path, venv_create_task = self.run_get_fresh_venv(asyncio.sleep(60))
+            self.assertTrue(venv_create_task.cancelled())
+            self.assertEqual(mock_clone.call_args[0], (template_path, venv_path))
+            self.assertTrue(venv_path.name.endswith("_clone"))
+            self.assertFalse(mock_create_venv.called)
+
+            # Fall back to creating a venv from scratch if cloning fails
+            async def create_venv(*args: Any, **kwargs: Any) -> Path:
+                return td_path / "venv"
+
+            mock_clone.return_value = False
+            mock_create_venv.side_effect = create_venv
+            venv_path, _ = self.run_get_fresh_venv(asyncio.sleep(60))
+            self.assertEqual(venv_path, td_path / "venv")
+            self.assertEqual(
+                mock_create_venv.call_args[1]["venv_path"],
+                mock_clone.call_args[0][1],
+            )
+
+    @patch("ptr.create_venv")
+    @patch("ptr._clone_venv")
+    @patch("ptr._get_venv_cache_path")
+    def test_get_fresh_venv_no_template(
+        self, mock_cache_path: Mock, mock_clone: Mock, mock_create_venv: Mock
+    ) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            template_path = td_path / "template"
+            bare_venv_path = td_path / "venv"
+            mock_cache_path.return_value = template_path
+
+            async def install_venv_pkgs(*args: Any, **kwargs: Any) -> Path:
+                venv_path: Path = kwargs["venv_path"]
+                return venv_path
+
+            async def created_venv() -> Path:
+                return bare_venv_path
+
+            # Finish the bare venv + snapshot it as the next run's template
+            def clone_venv(src_venv_path: Path, dest_venv_path: Path) -> bool:
+                (dest_venv_path / "bin").mkdir(parents=True)
+                return True
+
+            # The bare venv create failed
+            venv_path, _ = self.run_get_fresh_venv(async_none())
+            self.assertIsNone(venv_path)
+            self.assertFalse(mock_clone.called)
+
+            mock_create_venv.side_effect = install_venv_pkgs
+            mock_clone.side_effect = clone_venv
+            venv_path, _ = self.run_get_fresh_venv(created_venv())
+            self.assertEqual(venv_path, bare_venv_path)
+            self.assertFalse(mock_create_venv.call_args[1]["create"])
+            # Snapshotted aside + renamed into place so no run sees a partial copy
+            mock_clone.assert_called_once_with(
+                bare_venv_path, template_path.with_name(f"template.{getpid()}.tmp")
+            )
+            self.assertEqual(list(td_path.iterdir()), [template_path])
+            self.assertTrue((template_path / ptr.VENV_CACHE_MARKER).exists())
+
+    @patch("ptr._owned_by_us", return_value=False)
+    @patch("ptr.create_venv")
+    @patch("ptr._clone_venv")
+    @patch("ptr._get_venv_cache_path")
+    def test_get_fresh_venv_template_not_ours(
+        self,
+        mock_cache_path: Mock,
+        mock_clone: Mock,
+        mock_create_venv: Mock,
+        mock_owned: Mock,
+    ) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            template_path = td_path / "template"
+            touch_files(template_path / ptr.VENV_CACHE_MARKER)
+            mock_cache_path.return_value = template_path
+
+            async def install_venv_pkgs(*args: Any, **kwargs: Any) -> Path:
+                venv_path: Path = kwargs["venv_path"]
+                return venv_path
+
+            async def created_venv() -> Path:
+                return td_path / "venv"
+
+            # Neither cloned from nor snapshotted into
+            mock_create_venv.side_effect = install_venv_pkgs
+            venv_path, _ = self.run_get_fresh_venv(created_venv())
+            self.assertEqual(venv_path, td_path / "venv")
+            self.assertFalse(mock_clone.called)
+
+    @unittest.skipIf(ptr.WINDOWS, "Windows venvs can not be cloned")
+    def test_clone_venv(self) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            template_path = td_path / "template"
+            clone_path = td_path / "clone"
+            touch_files(template_path / "pyvenv.cfg")
+            (template_path / "bin").mkdir()
+            (template_path / "bin" / "pip").write_text(
+                f"#!{template_path}/bin/python\n", encoding=FILE_ENCODING
+            )
+            self.assertTrue(ptr._clone_venv(template_path, clone_path))
+            self.assertTrue((clone_path / "pyvenv.cfg").exists())
+            self.assertEqual(
+                (clone_path / "bin" / "pip").read_text(encoding=FILE_ENCODING),
+                f"#!{clone_path}/bin/python\n",
+            )
+
     def test_config(self) -> None:
         expected_pypi_url = "https://pypi.org/simple/"
         dc = ptr._config_default()
         self.assertEqual(dc["ptr"]["pypi_url"], expected_pypi_url)
+        self.assertEqual(int(dc["ptr"]["atonce"]), ptr._available_cpus())
         dc["ptr"]["cpu_count"] = "10"
 
-        td = Path(__file__).parent
-        sc = ptr._config_read(str(td), "ptrconfig.sample")
+        sc = ptr._config_read(str(BASE_PATH), "ptrconfig.sample")
         self.assertEqual(sc["ptr"].get("pypi_url", ""), expected_pypi_url)
         self.assertEqual(len(sc["ptr"].get("venv_pkgs", "").split()), 8)
+        # Found from a sub directory by walking up its parents
+        sc = ptr._config_read(str(BASE_PATH / "ci" / "nested"), "ptrconfig.sample")
+        self.assertEqual(len(sc["ptr"].get("venv_pkgs", "").split()), 8)
 
     @patch("ptr._gen_check_output", async_none)
     @patch("ptr._set_pip_mirror")
@@ -242,6 +492,18 @@ class TestPtr(unittest.TestCase):
             )
         )
 
+    @patch("ptr._gen_check_output", async_none)
+    @patch("ptr.LOG.info")
+    def test_create_venv_install_only(self, mock_info: Mock) -> None:
+        self.loop.run_until_complete(
+            ptr.create_venv("https://pip.com/", venv_path=Path("venv"), create=False)
+        )
+        self.assertTrue(
+            mock_info.call_args[0][0].startswith(
+                "Successfully installed venv_pkgs into venv"
+            )
+        )
+
     @patch("ptr._gen_check_output", check_site_package_config)
     @patch("ptr._set_pip_mirror")
     def test_create_venv_site_packages(self, mock_pip_mirror: Mock) -> None:
@@ -251,43 +513,150 @@ class TestPtr(unittest.TestCase):
             )
         )
 
+    def test_get_user_cache_path(self) -> None:
+        with TemporaryDirectory() as td:
+            with patch.dict(environ, {"XDG_CACHE_HOME": td}):
+                self.assertEqual(ptr._get_user_cache_path(), Path(td) / "ptr")
+                self.assertEqual(
+                    ptr._get_venv_cache_path("https://pip.com/", False, []).parents[1],
+                    Path(td) / "ptr",
+                )
+        # Relative XDG_CACHE_HOMEs are ignored
+        with patch.dict(environ, {"XDG_CACHE_HOME": "cache"}):
+            self.assertEqual(ptr._get_user_cache_path(), Path.home() / ".cache" / "ptr")
+
+    def test_owned_by_us(self) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            self.assertTrue(ptr._owned_by_us(td_path))
+            self.assertFalse(ptr._owned_by_us(td_path / "not_there"))
+            if not ptr.WINDOWS:
+                with patch("os.getuid", return_value=-1):
+                    self.assertFalse(ptr._owned_by_us(td_path))
+
+    def test_get_venv_cache_path(self) -> None:
+        cache_path = ptr._get_venv_cache_path("https://pip.com/", False, ["a", "b"])
+        self.assertEqual(cache_path.parent.name, "ptr_venv_cache")
+        self.assertEqual(
+            cache_path,
+            ptr._get_venv_cache_path("https://pip.com/", False, ["b", "a"]),
+        )
+        self.assertNotEqual(
+            cache_path, ptr._get_venv_cache_path("https://pip.com/", True, ["a", "b"])
+        )
+        self.assertNotEqual(
+            cache_path,
+            ptr._get_venv_cache_path(
+                "https://pip.com/", False, ["a", "b"], tests_require=["c"]
+            ),
+        )
+
     def test_find_setup_py(self) -> None:
-        base_path = Path(__file__).parent
-        found_setup_py = ptr.find_setup_pys(base_path, set()).pop()
-        self.assertEqual(str(found_setup_py.relative_to(base_path)), "setup.py")
+        found_setup_py = ptr.find_setup_pys(BASE_PATH, set()).pop()
+        self.assertEqual(str(found_setup_py.relative_to(BASE_PATH)), "setup.py")
 
     def test_find_setup_py_exclude_default(self) -> None:
         with TemporaryDirectory() as td:
             td_path = Path(td)
             build_path = td_path / "build-arm"
             cooper_path = td_path / "cooper"
+            tox_path = td_path / "cooper" / ".tox" / "py38"
 
-            touch_files(*(adir / "setup.py" for adir in (build_path, cooper_path)))
+            touch_files(
+                *(adir / "setup.py" for adir in (build_path, cooper_path, tox_path))
+            )
 
-            setup_pys = ptr.find_setup_pys(td_path, {"build*"})
+            default_excludes = ptr._config_default()["ptr"]["exclude_patterns"]
+            setup_pys = ptr.find_setup_pys(td_path, set(default_excludes.split()))
             self.assertEqual(len(setup_pys), 1)
             self.assertEqual(
                 setup_pys.pop().relative_to(td_path), Path("cooper/setup.py")
             )
+            # .ptrconfig's exclude_patterns replace the defaults
+            setup_pys = ptr.find_setup_pys(td_path, {"build*"})
+            self.assertEqual(len(setup_pys), 2)
 
     def test_generate_black_command(self) -> None:
+        # Pure command building - No files are read so no temp dir needed
         black_exe = Path("/bin/black")
-        with TemporaryDirectory() as td:
-            module_dir = Path(td)
+        self.assertEqual(
+            ptr._generate_black_cmd(Path("/module"), black_exe),
+            (str(black_exe), "--check", "."),
+        )
 
-            self.assertEqual(
-                ptr._generate_black_cmd(module_dir, black_exe),
-                (str(black_exe), "--check", "."),
+    def test_install_tests_require(self) -> None:
+        cmds: list[Sequence[str]] = []
+
+        async def fake_check_output(cmd: Sequence[str], **kwargs: Any) -> None:
+            cmds.append(cmd)
+
+        tests_to_run = {
+            Path("a/setup.py"): {"tests_require": ["peerme", "aiohttp"]},
+            Path("b/setup.py"): {"tests_require": ["peerme"]},
+            Path("c/setup.py"): {},
+        }
+        with patch("ptr._gen_check_output", fake_check_output):
+            self.loop.run_until_complete(
+                ptr._install_tests_require(Path("pip"), tests_to_run, {}, 30)
+            )
+            self.loop.run_until_complete(
+                ptr._install_tests_require(Path("pip"), {Path("setup.py"): {}}, {}, 30)
+            )
+        self.assertEqual(cmds, [("pip", "install", "aiohttp", "peerme")])
+
+    def test_install_batch(self) -> None:
+        cmds: list[Sequence[str]] = []
+
+        async def fake_check_output(cmd: Sequence[str], **kwargs: Any) -> None:
+            cmds.append(cmd)
+
+        tests_to_run: dict[Path, dict] = {
+            Path("a/setup.py"): {"test_suite_timeout": 60, "tests_require": ["pm"]},
+            Path("b/setup.py"): {"test_suite_timeout": 60},
+        }
+        with patch("ptr._gen_check_output", fake_check_output), patch(
+            "ptr.LOG.isEnabledFor", return_value=False
+        ):
+            self.assertTrue(
+                self.loop.run_until_complete(
+                    ptr._install_batch(
+                        Path("pip"), list(tests_to_run), tests_to_run, {}
+                    )
+                )
+            )
+        self.assertEqual(len(cmds), 1)
+        self.assertEqual(cmds[0][-3:], ("a", "b", "pm"))
+
+        with patch("ptr._gen_check_output", side_effect=CalledProcessError(1, "pip")):
+            self.assertFalse(
+                self.loop.run_until_complete(
+                    ptr._install_batch(
+                        Path("pip"), list(tests_to_run), tests_to_run, {}
+                    )
+                )
             )
 
     def test_generate_install_cmd(self) -> None:
         python_exe = "python3"
         module_dir = "/tmp/awesome"
         config = {"tests_require": ["peerme"]}
-        self.assertEqual(
-            ptr._generate_install_cmd(python_exe, module_dir, config),
-            (python_exe, "-v", "install", module_dir, "peerme"),
+        expected = (
+            python_exe,
+            "install",
+            "--disable-pip-version-check",
+            "--no-color",
+            module_dir,
+            "peerme",
         )
+        with patch("ptr.LOG.isEnabledFor", return_value=False):
+            self.assertEqual(
+                ptr._generate_install_cmd(python_exe, module_dir, config), expected
+            )
+        with patch("ptr.LOG.isEnabledFor", return_value=True):
+            self.assertEqual(
+                ptr._generate_install_cmd(python_exe, module_dir, config),
+                (python_exe, "-v", *expected[1:]),
+            )
 
     def test_generate_test_suite_cmd(self) -> None:
         coverage_exe = Path("/bin/coverage")
@@ -346,17 +715,39 @@ class TestPtr(unittest.TestCase):
                 ptr._generate_pylint_cmd(module_dir, pylint_exe, conf),
                 (str(pylint_exe), "--rcfile", str(cf), str(py1), str(py2)),
             )
+            # A pre-walked file list is used as-is
+            self.assertEqual(
+                ptr._generate_pylint_cmd(module_dir, pylint_exe, conf, [str(py1)]),
+                (str(pylint_exe), "--rcfile", str(cf), str(py1)),
+            )
 
     def test_generate_pyre_cmd(self) -> None:
-        with TemporaryDirectory() as td:
-            td_path = Path(td)
-            pyre_exe = Path("pyre")
-
-            conf = {"run_pyre": True}
-            expected = (str(pyre_exe), "--source-directory", str(td_path), "check")
-            if ptr.WINDOWS:
-                expected = ()
-            self.assertEqual(ptr._generate_pyre_cmd(td_path, pyre_exe, conf), expected)
+        module_dir = Path("/module")
+        pyre_exe = Path("pyre")
+
+        conf = {"run_pyre": True}
+        expected: tuple[str, ...] = (
+            str(pyre_exe),
+            "--source-directory",
+            str(module_dir),
+            "check",
+        )
+        if ptr.WINDOWS:
+            expected = ()
+        self.assertEqual(ptr._generate_pyre_cmd(module_dir, pyre_exe, conf), expected)
+
+    def test_get_venv_pkgs(self) -> None:
+        tests_to_run: dict[Path, dict] = {
+            Path("a/setup.py"): {"run_black": True, "run_mypy": False},
+            Path("b/setup.py"): {"run_mypy": True},
+        }
+        with patch(
+            "ptr.VENV_PKGS", ("black==22.1", "coverage", "flake8", "mypy", "pip")
+        ):
+            self.assertEqual(
+                ptr._get_venv_pkgs(tests_to_run),
+                ["black==22.1", "coverage", "mypy", "pip"],
+            )
 
     def test_get_site_packages_path_error(self) -> None:
         with TemporaryDirectory() as td:
@@ -373,11 +764,10 @@ class TestPtr(unittest.TestCase):
     ) -> None:
         mock_pyproject.return_value = {}
         mock_setup_cfg.return_value = {}
-        base_path = Path(__file__).parent
         stats: dict[str, int] = defaultdict(int)
-        test_modules = ptr._get_test_modules(base_path, stats, True, True)
+        test_modules = ptr._get_test_modules(BASE_PATH, stats, True, True)
         self.assertEqual(
-            test_modules[base_path / "setup.py"],
+            test_modules[BASE_PATH / "setup.py"],
             ptr_tests_fixtures.EXPECTED_TEST_PARAMS,
         )
         self.assertEqual(stats["total.non_ptr_setup_pys"], 0)
@@ -386,65 +776,161 @@ class TestPtr(unittest.TestCase):
         # Make sure we don't run print even tho we set the option to True
         self.assertFalse(mock_print.called)
 
+    def test_get_test_modules_process_pool(self) -> None:
+        stats: dict[str, int] = defaultdict(int)
+        expected = ptr._get_test_modules(BASE_PATH, stats, True, False)
+        with patch("ptr.PARSE_POOL_MIN_SETUP_PYS", 1):
+            # A warm parse cache beats starting workers
+            with patch("ptr.ProcessPoolExecutor") as mock_pool:
+                self.assertEqual(
+                    ptr._get_test_modules(BASE_PATH, stats, True, False), expected
+                )
+            self.assertFalse(mock_pool.called)
+
+            ptr._parse_ptr_params.cache_clear()
+            self.assertEqual(
+                ptr._get_test_modules(BASE_PATH, stats, True, False), expected
+            )
+
+    def test_parse_ptr_params_cached(self) -> None:
+        with TemporaryDirectory() as td:
+            setup_py = Path(td) / "setup.py"
+            setup_py.write_text("ptr_params = {'test_suite': 'a'}\n", FILE_ENCODING)
+            key = ptr._get_config_files_key(setup_py)
+            self.assertEqual(key[:2], (None, None))
+            self.assertEqual(ptr._parse_ptr_params(setup_py, key)["test_suite"], "a")
+            with patch("ptr._parse_setup_params") as mock_parse:
+                ptr._parse_ptr_params(setup_py, key)
+                self.assertFalse(mock_parse.called)
+
+            setup_py.write_text("ptr_params = {'test_suite': 'abc'}\n", FILE_ENCODING)
+            new_key = ptr._get_config_files_key(setup_py)
+            self.assertNotEqual(key, new_key)
+            self.assertEqual(
+                ptr._parse_ptr_params(setup_py, new_key)["test_suite"], "abc"
+            )
+
     def test_gen_output(self) -> None:
         test_cmd = ("echo.exe", "''") if ptr.WINDOWS else ("/bin/echo",)
+        cmds = [test_cmd]
+        # TODO: Test this on Windows and ensure we capture failures corerctly
+        if not ptr.WINDOWS:
+            cmds.append(("/usr/bin/false" if ptr.MACOSX else "/bin/false",))
+
+        # Run the commands concurrently - Each is a separate fork + exec
+        async def run_cmds() -> list[Any]:
+            return await asyncio.gather(
+                *(ptr._gen_check_output(cmd) for cmd in cmds), return_exceptions=True
+            )
 
-        stdout, stderr = self.loop.run_until_complete(ptr._gen_check_output(test_cmd))
+        results = self.loop.run_until_complete(run_cmds())
+        stdout, stderr = results[0]
         self.assertTrue(b"\n" in stdout)
         self.assertEqual(stderr, None)
+        if not ptr.WINDOWS:
+            self.assertIsInstance(results[1], CalledProcessError)
 
-        if ptr.WINDOWS:
-            return
+    def test_gen_output_cancelled(self) -> None:
+        processes: list[asyncio.subprocess.Process] = []
+        create_subprocess_exec = asyncio.create_subprocess_exec
 
-        # TODO: Test this on Windows and ensure we capture failures corerctly
-        with self.assertRaises(CalledProcessError):
-            if ptr.MACOSX:
-                false = "/usr/bin/false"
-            else:
-                false = "/bin/false"
+        async def capture_process(*args: Any, **kwargs: Any) -> Any:
+            process = await create_subprocess_exec(*args, **kwargs)
+            processes.append(process)
+            return process
 
-            self.loop.run_until_complete(ptr._gen_check_output((false,)))
+        async def cancel_sleep() -> None:
+            task = asyncio.create_task(
+                ptr._gen_check_output((executable, "-c", "import time; time.sleep(7)"))
+            )
+            while not processes:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with patch("ptr.asyncio.create_subprocess_exec", capture_process):
+            self.loop.run_until_complete(cancel_sleep())
+        # Cancelling has killed + reaped the child rather than leaving it running
+        self.assertIsNotNone(processes[0].returncode)
+
+    def test_gen_output_env(self) -> None:
+        # Real spawn on the (uv)loop with the read only envs ptr passes around
+        env = ptr._get_step_envs(ptr._set_build_env(None), Path("/venv"), False)[
+            ptr.StepName.tests_run
+        ]
+        stdout, _ = self.loop.run_until_complete(
+            ptr._gen_check_output(
+                (executable, "-c", "import os; print(os.environ['PYTHONPATH'])"),
+                env=env,
+            )
+        )
+        self.assertEqual(stdout.decode("utf8").strip(), str(Path("/venv")))
+
+    def test_gen_output_split_stderr(self) -> None:
+        cmd = (
+            executable,
+            "-c",
+            "import sys; print('out'); print('err', file=sys.stderr)",
+        )
+        stdout, stderr = self.loop.run_until_complete(
+            ptr._gen_check_output(cmd, merge_stderr=False)
+        )
+        self.assertEqual(stdout.decode("utf8").strip(), "out")
+        self.assertEqual(stderr.decode("utf8").strip() if stderr else "", "err")
 
     def test_handle_debug(self) -> None:
         self.assertEqual(ptr._handle_debug(True), True)
 
-    @patch("ptr.asyncio.get_event_loop", fake_get_event_loop)
     @patch("ptr.async_main", return_zero)
     @patch("ptr._validate_base_dir")
     @patch("ptr.argparse.ArgumentParser.parse_args")
     def test_main(self, mock_args: Mock, mock_validate: Mock) -> None:
         with patch("ptr.asyncio.run") as mock_run, self.assertRaises(SystemExit):
             ptr.main()
-            self.assertTrue(mock_run.called)
+        self.assertTrue(mock_run.called)
 
     def test_parse_pyproject_toml(self) -> None:
-        tmp_dir = Path(gettempdir())
-        pyproject_toml = tmp_dir / ptr.PYPROJECT_TOML
-        setup_py = tmp_dir / "setup.py"
-
-        with pyproject_toml.open("w", encoding=FILE_ENCODING) as pcp:
-            pcp.write(ptr_tests_fixtures.SAMPLE_PYPROJECT)
-
-        # No pyproject.toml file exists
-        self.assertEqual(ptr.parse_pyproject_toml(setup_py.parent), {})
-        # No ptr section
-        self.assertEqual(ptr.parse_pyproject_toml(setup_py, "not_a_tool"), {})
-        # Everything works
-        self.assertEqual(
-            ptr.parse_pyproject_toml(setup_py), ptr_tests_fixtures.EXPECTED_TEST_PARAMS
-        )
+        # Own dir per test so parallel runs don't clobber each other's files
+        with TemporaryDirectory() as td:
+            tmp_dir = Path(td) / "module"
+            tmp_dir.mkdir()
+            pyproject_toml = tmp_dir / ptr.PYPROJECT_TOML
+            setup_py = tmp_dir / "setup.py"
+
+            with pyproject_toml.open("w", encoding=FILE_ENCODING) as pcp:
+                pcp.write(ptr_tests_fixtures.SAMPLE_PYPROJECT)
+
+            # No pyproject.toml file exists
+            self.assertEqual(ptr.parse_pyproject_toml(setup_py.parent), {})
+            # No ptr section
+            self.assertEqual(ptr.parse_pyproject_toml(setup_py, "not_a_tool"), {})
+            # Everything works
+            self.assertEqual(
+                ptr.parse_pyproject_toml(setup_py),
+                ptr_tests_fixtures.EXPECTED_TEST_PARAMS,
+            )
 
     def test_parse_setup_cfg(self) -> None:
-        tmp_dir = Path(gettempdir())
-        setup_cfg = tmp_dir / "setup.cfg"
-        setup_py = tmp_dir / "setup.py"
+        with TemporaryDirectory() as td:
+            tmp_dir = Path(td)
+            setup_cfg = tmp_dir / "setup.cfg"
+            setup_py = tmp_dir / "setup.py"
 
-        with setup_cfg.open("w", encoding=FILE_ENCODING) as scp:
-            scp.write(ptr_tests_fixtures.SAMPLE_SETUP_CFG)
+            with setup_cfg.open("w", encoding=FILE_ENCODING) as scp:
+                scp.write(ptr_tests_fixtures.SAMPLE_SETUP_CFG)
 
-        self.assertEqual(
-            ptr.parse_setup_cfg(setup_py), ptr_tests_fixtures.EXPECTED_TEST_PARAMS
-        )
+            self.assertEqual(
+                ptr.parse_setup_cfg(setup_py), ptr_tests_fixtures.EXPECTED_TEST_PARAMS
+            )
+
+            # Only the prefix is removed - Not leading/trailing chars it shares
+            with setup_cfg.open("w", encoding=FILE_ENCODING) as scp:
+                scp.write("[ptr]\nrequired_coverage_api/core.py = 90\n")
+            self.assertEqual(
+                ptr.parse_setup_cfg(setup_py)["required_coverage"],
+                {"api/core.py": 90},
+            )
 
     @patch("ptr.print")  # noqa
     def test_print_non_configured_modules(self, mock_print: Mock) -> None:
@@ -459,20 +945,56 @@ class TestPtr(unittest.TestCase):
         self.assertEqual(stats["total.fails"], 1)
         self.assertEqual(stats["total.passes"], 1)
         self.assertEqual(stats["total.timeouts"], 1)
+        mock_print.assert_called_once()
+        self.assertEqual(stats["pct.setup_py_ptr_enabled"], 0)
+
+        stats = ptr.print_test_results(
+            ptr_tests_fixtures.EXPECTED_COVERAGE_RESULTS[:1] * 29,
+            {"total.setup_pys": 100},
+        )
+        self.assertEqual(stats["pct.setup_py_ptr_enabled"], 29)
 
     @patch("ptr.LOG.info")  # noqa
     def test_process_reporter(self, mock_log: Mock) -> None:
-        def qsize(*args: Any, **kwargs: Any) -> int:
-            global TOTAL_REPORTER_TESTS
-            TOTAL_REPORTER_TESTS -= 1
-            return TOTAL_REPORTER_TESTS
-
-        with patch("asyncio.Queue.qsize", qsize):
-            queue: asyncio.Queue = asyncio.Queue()
-            self.loop.run_until_complete(
-                ptr._progress_reporter(0.1, queue, int(TOTAL_REPORTER_TESTS / 2))
-            )
+        test_results: list[ptr.test_result] = []
+        total_tests = 2
+
+        # A zero interval reports on every loop iteration - No wall clock sleeps
+        async def run_loop_iterations() -> None:
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        # Only changed counts get logged and nothing after stop()
+        async def run_reporter() -> None:
+            stop = ptr._progress_reporter(0, test_results, total_tests)
+            await run_loop_iterations()
+            test_results.append(ptr_tests_fixtures.EXPECTED_COVERAGE_RESULTS[0])
+            await run_loop_iterations()
+            stop()
+            test_results.append(ptr_tests_fixtures.EXPECTED_COVERAGE_RESULTS[0])
+            await run_loop_iterations()
+
+        self.loop.run_until_complete(run_reporter())
         self.assertEqual(mock_log.call_count, 2)
+        self.assertTrue(mock_log.call_args.args[0].startswith("1 / 2"))
+
+    def test_rmtree_in_background(self) -> None:
+        with TemporaryDirectory() as td:
+            venv_path = Path(td) / "venv"
+            touch_files(venv_path / "bin" / "python")
+            ptr._rmtree_in_background(venv_path)
+            self.assertFalse(venv_path.exists())
+
+    def test_get_step_envs(self) -> None:
+        venv_path = Path("/venv")
+        step_envs = ptr._get_step_envs({"HOME": "/root"}, venv_path, True)
+        self.assertEqual(
+            step_envs[ptr.StepName.pyre_run],
+            {"HOME": "/root", "PYTHONPATH": str(venv_path)},
+        )
+        self.assertEqual(step_envs[ptr.StepName.tests_run]["PYTHONWARNINGS"], "error")
+        step_envs = ptr._get_step_envs({}, venv_path, False)
+        self.assertNotIn("PYTHONWARNINGS", step_envs[ptr.StepName.tests_run])
 
     def test_set_build_env(self) -> None:
         local_build_path = Path(gettempdir())
@@ -483,6 +1005,7 @@ class TestPtr(unittest.TestCase):
         self.assertTrue(
             str(local_build_path / "include") in build_env["CPLUS_INCLUDE_PATH"]
         )
+        self.assertEqual(build_env["PIP_DISABLE_PIP_VERSION_CHECK"], "1")
 
     def test_set_pip_mirror(self) -> None:
         with TemporaryDirectory() as td:
@@ -493,29 +1016,248 @@ class TestPtr(unittest.TestCase):
                 conf_file = pcfp.read()
             self.assertTrue("[global]" in conf_file)
             self.assertTrue("/simple" in conf_file)
+            # pip keeps its own per user wheel cache
+            self.assertFalse("cache-dir" in conf_file)
 
     @patch("ptr._test_steps_runner", fake_test_steps_runner)
     def test_test_runner(self) -> None:
-        queue: asyncio.Queue = asyncio.Queue()
         with TemporaryDirectory() as td:
             td_path = Path(td)
             setup_py_path = td_path / "setup.py"
             with setup_py_path.open("w", encoding=FILE_ENCODING) as spfp:
                 print(ptr_tests_fixtures.SAMPLE_SETUP_PY, file=spfp)
 
-            queue.put_nowait(setup_py_path)
             tests_to_run: dict[Path, dict] = {}
             tests_to_run[setup_py_path] = ptr_tests_fixtures.SAMPLE_SETUP_PY_PTR
             test_results: list[ptr.test_result] = []
             stats: dict[str, int] = defaultdict(int)
             self.loop.run_until_complete(
                 ptr._test_runner(
-                    queue, tests_to_run, test_results, td_path, False, stats, True, 69
+                    [setup_py_path],
+                    [0],
+                    tests_to_run,
+                    test_results,
+                    td_path,
+                    ptr._get_tool_paths(td_path),
+                    {},
+                    False,
+                    stats,
+                    True,
                 )
             )
             self.assertEqual(len(test_results), 1)
             self.assertTrue("has passed all configured tests" in test_results[0].output)
 
+    def run_run_tests(self, td_path: Path, **kwargs: Any) -> tuple[int, dict]:
+        """run_tests() one suite with (cached) venv args - Nothing really runs"""
+        stats: dict[str, int] = dict.fromkeys(ptr.STATS_COUNTERS, 0)
+        run_tests_args: dict[str, Any] = {
+            "atonce": 1,
+            "mirror": "https://pip.com/",
+            "tests_to_run": {td_path / "setup.py": {"test_suite_timeout": 1}},
+            "progress_interval": 0,
+            "venv_path": None,
+            "venv_keep": False,
+            "print_cov": False,
+            "stats": stats,
+            "stats_file": str(td_path / "stats.json"),
+            "venv_timeout": 1,
+            "error_on_warnings": False,
+            "system_site_packages": False,
+            "venv_cache": True,
+        }
+        run_tests_args.update(kwargs)
+        return (
+            self.loop.run_until_complete(ptr.run_tests(**run_tests_args)),
+            stats,
+        )
+
+    @unittest.skipIf(ptr.WINDOWS, "Windows venvs can not be cloned")
+    @patch("ptr._test_steps_runner", fake_test_steps_runner)
+    @patch("ptr._rmtree_in_background")
+    @patch("ptr.create_venv")
+    @patch("ptr._get_venv_cache_path")
+    @patch("ptr.print")
+    def test_run_tests_venv_cache(
+        self,
+        mock_print: Mock,
+        mock_cache_path: Mock,
+        mock_create_venv: Mock,
+        mock_rmtree: Mock,
+    ) -> None:
+        async def create_venv(*args: Any, **kwargs: Any) -> None | Path:
+            venv_path: None | Path = kwargs.get("venv_path")
+            if venv_path:
+                (venv_path / "bin").mkdir(parents=True)
+                (venv_path / "bin" / "pip").write_text(
+                    f"#!{venv_path}/bin/python\n", encoding=FILE_ENCODING
+                )
+            return venv_path
+
+        mock_create_venv.side_effect = create_venv
+        with TemporaryDirectory() as td, patch("ptr.gettempdir", return_value=td):
+            td_path = Path(td)
+            cache_path = td_path / "cache" / "venv"
+            clone_path = td_path / f"ptr_venv_{getpid()}_clone"
+            mock_cache_path.return_value = cache_path
+
+            # Cache miss - Build the venv aside + publish it to the cache
+            returncode, stats = self.run_run_tests(td_path)
+            self.assertEqual(returncode, 0)
+            self.assertEqual(
+                mock_create_venv.call_args[1]["venv_path"],
+                cache_path.with_name(f"venv.{getpid()}.tmp"),
+            )
+            self.assertEqual(list(cache_path.parent.iterdir()), [cache_path])
+            self.assertTrue((cache_path / ptr.VENV_CACHE_MARKER).exists())
+            self.assertEqual(
+                (cache_path / "bin" / "pip").read_text(encoding=FILE_ENCODING),
+                f"#!{cache_path}/bin/python\n",
+            )
+            self.assertIn("venv_create_time", stats)
+            # Tests run in a clone of the cached venv which is then removed
+            mock_rmtree.assert_called_once_with(clone_path)
+
+            # Cache hit - Clone it without creating anything
+            mock_create_venv.reset_mock()
+            mock_rmtree.reset_mock()
+            returncode, stats = self.run_run_tests(td_path)
+            self.assertEqual(returncode, 0)
+            self.assertFalse(mock_create_venv.called)
+            self.assertEqual(
+                (clone_path / "bin" / "pip").read_text(encoding=FILE_ENCODING),
+                f"#!{clone_path}/bin/python\n",
+            )
+            mock_rmtree.assert_called_once_with(clone_path)
+
+            # Someone else's cache - Use a throwaway venv instead
+            with patch("ptr._owned_by_us", return_value=False):
+                returncode, _ = self.run_run_tests(td_path)
+            self.assertNotIn("venv_path", mock_create_venv.call_args[1])
+            self.assertEqual(returncode, 3)
+
+    @unittest.skipIf(ptr.WINDOWS, "Windows venvs can not be cloned")
+    def test_publish_venv(self) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            venv_path = td_path / "venv"
+            build_path = td_path / "venv.1.tmp"
+            (build_path / "bin").mkdir(parents=True)
+            self.assertTrue(ptr._publish_venv(build_path, venv_path))
+            self.assertTrue((venv_path / ptr.VENV_CACHE_MARKER).exists())
+            self.assertFalse(build_path.exists())
+
+            # Another run published first - Our build gets discarded
+            (build_path / "bin").mkdir(parents=True)
+            touch_files(build_path / "ours")
+            self.assertFalse(ptr._publish_venv(build_path, venv_path))
+            self.assertFalse(build_path.exists())
+            self.assertFalse((venv_path / "ours").exists())
+
+            # A killed run's incomplete venv gets replaced
+            (venv_path / ptr.VENV_CACHE_MARKER).unlink()
+            (build_path / "bin").mkdir(parents=True)
+            self.assertTrue(ptr._publish_venv(build_path, venv_path))
+            self.assertTrue((venv_path / ptr.VENV_CACHE_MARKER).exists())
+
+    @patch("ptr._rmtree_in_background")
+    def test_prune_venv_cache(self, mock_rmtree: Mock) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            old_venv = td_path / "old"
+            new_venv = td_path / "new"
+            killed_build = td_path / "new.1.tmp"
+            touch_files(
+                old_venv / ptr.VENV_CACHE_MARKER,
+                new_venv / ptr.VENV_CACHE_MARKER,
+                killed_build / "pyvenv.cfg",
+                td_path / "not_a_venv",
+            )
+            old_mtime = time() - ptr.VENV_CACHE_MAX_AGE - 60
+            utime(old_venv / ptr.VENV_CACHE_MARKER, (old_mtime, old_mtime))
+            utime(killed_build, (old_mtime, old_mtime))
+            ptr._prune_venv_cache(td_path)
+            self.assertEqual(
+                sorted(c[0][0] for c in mock_rmtree.call_args_list),
+                [killed_build, old_venv],
+            )
+            # Missing cache dirs are fine
+            mock_rmtree.reset_mock()
+            ptr._prune_venv_cache(td_path / "missing")
+            self.assertFalse(mock_rmtree.called)
+
+    @patch("ptr._test_steps_runner", fake_test_steps_runner)
+    @patch("ptr._rmtree_in_background")
+    @patch("ptr._get_fresh_venv")
+    @patch("ptr.print")
+    def test_run_tests_venv_create_task(
+        self, mock_print: Mock, mock_fresh_venv: Mock, mock_rmtree: Mock
+    ) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+
+            async def fresh_venv(*args: Any, **kwargs: Any) -> Path:
+                return td_path
+
+            mock_fresh_venv.side_effect = fresh_venv
+            returncode, stats = self.run_run_tests(
+                td_path, venv_cache=False, venv_create_task=Mock()
+            )
+            self.assertEqual(returncode, 0)
+            self.assertIn("venv_create_time", stats)
+            # Fresh venvs get removed once we're done with them
+            mock_rmtree.assert_called_once_with(td_path)
+
+    @patch("ptr.create_venv", async_none)
+    def test_run_tests_bad_args(self) -> None:
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            # Unable to create a venv
+            self.assertEqual(self.run_run_tests(td_path, venv_cache=False)[0], 3)
+            self.assertEqual(
+                self.run_run_tests(td_path, venv_path=td_path, atonce=0)[0], 254
+            )
+            self.assertEqual(
+                self.run_run_tests(td_path, venv_path=td_path, batch_size=0)[0], 254
+            )
+
+    def test_test_steps_runner_lint_sem(self) -> None:
+        running = [0, 0]  # [now, max]
+
+        async def track_concurrency(*args: Any, **kwargs: Any) -> tuple[bytes, None]:
+            running[0] += 1
+            running[1] = max(running)
+            await asyncio.sleep(0)
+            running[0] -= 1
+            return (b"", None)
+
+        with TemporaryDirectory() as td:
+            td_path = Path(td)
+            fake_setup_py = td_path / "setup.py"
+            fake_venv_path = td_path / "venv"
+            etp = expected_params_without("test_suite", "required_coverage")
+
+            async def run_steps(max_lints: None | int) -> None:
+                # Make the Semaphore on the running loop (< 3.10 binds at init)
+                await ptr._test_steps_runner(
+                    69,
+                    {fake_setup_py: etp},
+                    fake_setup_py,
+                    fake_venv_path,
+                    ptr._get_tool_paths(fake_venv_path),
+                    {},
+                    {},
+                    False,
+                    lint_sem=asyncio.Semaphore(max_lints) if max_lints else None,
+                )
+
+            for max_lints, expected_max in ((None, 2), (1, 1)):
+                running[1] = 0
+                with patch("ptr._gen_check_output", track_concurrency):
+                    self.loop.run_until_complete(run_steps(max_lints))
+                # Unbounded the linters overlap - Bounded they take turns
+                self.assertEqual(min(running[1], 2), expected_max)
+
     @patch("ptr._gen_check_output", return_bytes_output)
     @patch("ptr.print")
     def test_test_steps_runner(self, mock_print: Mock) -> None:
@@ -527,11 +1269,12 @@ class TestPtr(unittest.TestCase):
             fake_venv_lib_path.mkdir(parents=True)
             # Windows can not run pyre
             no_pyre = ptr.WINDOWS
-            tsr_params = [
+            tsr_params: list[Any] = [
                 69,  # test_start_time
                 {fake_setup_py: {}},  # tests_to_run
                 fake_setup_py,
                 fake_venv_path,
+                ptr._get_tool_paths(fake_venv_path),
                 {},  # env
                 {},  # stats
                 True,  # error_on_warnings
@@ -540,7 +1283,7 @@ class TestPtr(unittest.TestCase):
 
             # Run everything + with print_cov
             tsr_params[1] = {fake_setup_py: ptr_tests_fixtures.EXPECTED_TEST_PARAMS}
-            tsr_params[7] = True
+            tsr_params[8] = True
             self.assertEqual(
                 self.loop.run_until_complete(
                     ptr._test_steps_runner(*tsr_params)  # pyre-ignore
@@ -550,10 +1293,9 @@ class TestPtr(unittest.TestCase):
 
             # Test we run coverage when required_coverage does not exist
             # but we have print_cov True
-            etp = deepcopy(ptr_tests_fixtures.EXPECTED_TEST_PARAMS)
-            del etp["required_coverage"]
+            etp = expected_params_without("required_coverage")
             tsr_params[1] = {fake_setup_py: etp}
-            tsr_params[7] = True
+            tsr_params[8] = True
             self.assertEqual(
                 self.loop.run_until_complete(
                     ptr._test_steps_runner(*tsr_params)  # pyre-ignore
@@ -562,10 +1304,9 @@ class TestPtr(unittest.TestCase):
             )
 
             # Run everything but black + no print cov
-            etp = deepcopy(ptr_tests_fixtures.EXPECTED_TEST_PARAMS)
-            del etp["run_black"]
+            etp = expected_params_without("run_black")
             tsr_params[1] = {fake_setup_py: etp}
-            tsr_params[7] = False
+            tsr_params[8] = False
             self.assertEqual(
                 # pyre-ignore[6]: Tests ...
                 self.loop.run_until_complete(ptr._test_steps_runner(*tsr_params)),
@@ -574,11 +1315,9 @@ class TestPtr(unittest.TestCase):
 
             # Run everything but test_suite with print_cov
             expected_no_pyre_tests = (None, 7) if no_pyre else (None, 8)
-            etp = deepcopy(ptr_tests_fixtures.EXPECTED_TEST_PARAMS)
-            del etp["test_suite"]
-            del etp["required_coverage"]
+            etp = expected_params_without("test_suite", "required_coverage")
             tsr_params[1] = {fake_setup_py: etp}
-            tsr_params[7] = True
+            tsr_params[8] = True
             self.assertEqual(
                 # pyre-ignore[6]: Tests ...
                 self.loop.run_until_complete(ptr._test_steps_runner(*tsr_params)),
@@ -598,6 +1337,16 @@ class TestPtr(unittest.TestCase):
         ptr._validate_base_dir(gettempdir() + "6969")
         mock_exit.assert_called_once()
 
+    def test_read_prior_runtimes(self) -> None:
+        with TemporaryDirectory() as td:
+            jf_path = Path(td) / "unittest.json"
+            self.assertEqual(ptr._read_prior_runtimes(str(jf_path)), {})
+            ptr._write_stats_file(
+                str(jf_path),
+                {"suite.ptr_runtime": 69, "suite.ptr_completed_steps": 7, "total": 1},
+            )
+            self.assertEqual(ptr._read_prior_runtimes(str(jf_path)), {"ptr": 69})
+
     def test_write_stats_file(self) -> None:
         with TemporaryDirectory() as td:
             td_path = Path(td)
@@ -605,6 +1354,14 @@ class TestPtr(unittest.TestCase):
             stats = {"total": 69, "half": 35}
             ptr._write_stats_file(str(jf_path), stats)
             self.assertTrue(jf_path.exists())
+            # Both serializers write the same sorted + indented JSON
+            with patch("ptr.orjson", None):
+                stdlib_path = td_path / "stdlib.json"
+                ptr._write_stats_file(str(stdlib_path), stats)
+            self.assertEqual(
+                jf_path.read_text(encoding=FILE_ENCODING),
+                stdlib_path.read_text(encoding=FILE_ENCODING),
+            )
 
     @patch("ptr.LOG.exception")
     def test_write_stats_file_raise(self, mock_log: Mock) -> None:
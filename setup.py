@@ -39,13 +39,11 @@ ptr_params = {
 
 def get_long_desc() -> str:
     repo_base = Path(__file__).parent
-    long_desc = ""
-    for info_file in (repo_base / "README.md", repo_base / "CHANGES.md"):
-        with info_file.open("r", encoding="utf8") as ifp:
-            long_desc += ifp.read()
-        long_desc += "\n\n"
-
-    return long_desc
+    # Read each file in one go and decode once - join rather than +=
+    info_files = (repo_base / "README.md", repo_base / "CHANGES.md")
+    return b"".join(
+        info_file.read_bytes() + b"\n\n" for info_file in info_files
+    ).decode("utf8")
 
 
 setup(
@@ -71,6 +69,13 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=["tomli>=1.1.0; python_full_version < '3.11.0a7'"],
+    extras_require={
+        "orjson": ["orjson"],
+        "uvloop": [
+            "uvloop; sys_platform != 'win32'",
+            "winloop; sys_platform == 'win32'",
+        ],
+    },
     entry_points={"console_scripts": ["ptr = ptr:main"]},
     test_suite=ptr_params["test_suite"],
 )